@@ -0,0 +1,278 @@
+# benchmarks/run_benchmarks.py
+#
+# Import benchmarks on synthetic beatmaps and replays:
+#   python benchmarks/run_benchmarks.py [--cases small,large] [--repeat 5] [--output results.json]
+#   blender -b --python benchmarks/run_benchmarks.py -- [same arguments] [--import-type BASE]
+#
+# Standalone runs time the bpy-free hot paths (parsers, hit object store, timing lookups, slider
+# evaluation, hit judgement). Inside Blender the data manager, check_hits, the import plan and the
+# full import are timed as well and the created datablocks are counted.
+# --baseline compares against an earlier results file and flags stages that got slower.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import types
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from synthetic import CASES, write_case
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+def load_package():
+    if bpy is not None:
+        sys.path.insert(0, REPO_DIR)
+        return
+    # Outside Blender the add-on's __init__ (operator and panel registration) cannot be imported,
+    # only register the package path so the bpy-free modules resolve
+    package = types.ModuleType("osu_importer")
+    package.__path__ = [os.path.join(REPO_DIR, "osu_importer")]
+    sys.modules["osu_importer"] = package
+
+def measure(func, repeat, setup=None):
+    durations = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    timing = {
+        "min_ms": round(min(durations), 3),
+        "mean_ms": round(sum(durations) / len(durations), 3),
+        "max_ms": round(max(durations), 3),
+    }
+    return timing, result
+
+def object_end_times(osu_parser, store, timing_point_index):
+    slider_multiplier = float(osu_parser.difficulty_settings.get("SliderMultiplier", 1.4))
+    end_times = store.data["time"].astype(np.float64)
+    for index, slider_data in store.slider_data.items():
+        beat_duration, inherited_multiplier = timing_point_index.lookup(int(store.data["time"][index]))
+        end_times[index] += (slider_data.pixel_length / (slider_multiplier * 100) * beat_duration
+                             * slider_data.repeat_count / inherited_multiplier)
+    for index in np.flatnonzero(store.data["hit_type"] & 8).tolist():
+        end_times[index] = float(store.extras[index][0])
+    return end_times
+
+def run_standalone_stages(osu_file_path, osr_file_path, repeat):
+    from osu_importer.parsers.beatmap_cache import BeatmapCache
+    from osu_importer.parsers.osu_parser import OsuParser, OsrParser
+    from osu_importer.parsers.hitobjects import HitObjectStore, COMBO_COLORS
+    from osu_importer.parsers.timing_points import TimingPointIndex
+    from osu_importer.utils.slider_curves import build_slider_path
+    from osu_importer.utils.hit_judgement import judge_hits
+
+    stages = {}
+    stages["parse_osu"], osu_parser = measure(lambda: OsuParser(osu_file_path, cache=BeatmapCache()), repeat)
+
+    warm_cache = BeatmapCache()
+    OsuParser(osu_file_path, cache=warm_cache)
+    stages["parse_osu_cached"], _ = measure(lambda: OsuParser(osu_file_path, cache=warm_cache), repeat)
+
+    stages["parse_osr"], osr_parser = measure(lambda: OsrParser(osr_file_path), repeat)
+
+    def build_store():
+        store = HitObjectStore(osu_parser.hitobject_tokens)
+        store.assign_combos(len(COMBO_COLORS))
+        return store
+
+    stages["hitobject_store"], store = measure(build_store, repeat)
+
+    def lookup_timing():
+        timing_point_index = TimingPointIndex(osu_parser.timing_points)
+        for time_ms in store.data["time"].tolist():
+            timing_point_index.lookup(time_ms)
+        return timing_point_index
+
+    stages["timing_lookup"], timing_point_index = measure(lookup_timing, repeat)
+
+    def evaluate_sliders():
+        return [
+            build_slider_path(slider_data.curve_type, slider_data.control_points, slider_data.pixel_length)
+            for slider_data in store.slider_data.values()
+        ]
+
+    stages["slider_paths"], slider_paths = measure(evaluate_sliders, repeat)
+
+    end_times = object_end_times(osu_parser, store, timing_point_index)
+    od = float(osu_parser.difficulty_settings.get("OverallDifficulty", 5.0))
+    stages["judge_hits"], (was_hit, _, _) = measure(lambda: judge_hits(
+        object_times=store.data["time"],
+        end_times=end_times,
+        hit_types=store.data["hit_type"],
+        key_times=osr_parser.times,
+        keys=osr_parser.keys,
+        hit_window=max(200 - (10 * od), 0)
+    ), repeat)
+
+    counts = {
+        "hitobjects": len(store),
+        "slider_path_points": sum(len(path.points) for path in slider_paths),
+        "replay_frames": len(osr_parser.times),
+        "hits": int(was_hit.sum()),
+    }
+    return stages, counts
+
+def count_datablocks():
+    actions = list(bpy.data.actions)
+    fcurves = [fcurve for action in actions for fcurve in action.fcurves]
+    return {
+        "objects": len(bpy.data.objects),
+        "meshes": len(bpy.data.meshes),
+        "curves": len(bpy.data.curves),
+        "materials": len(bpy.data.materials),
+        "node_groups": len(bpy.data.node_groups),
+        "collections": len(bpy.data.collections),
+        "actions": len(actions),
+        "fcurves": len(fcurves),
+        "keyframes": sum(len(fcurve.keyframe_points) for fcurve in fcurves),
+    }
+
+def run_blender_stages(osu_file_path, osr_file_path, repeat, options, fps):
+    from osu_importer.batch import ensure_registered, apply_options, reset_options
+    from osu_importer.config import ImportConfig
+    from osu_importer.delete import delete_imported_data
+    from osu_importer.exec import run_import
+    from osu_importer.import_plan import build_import_plan
+    from osu_importer.osu_data_manager import OsuDataManager
+    from osu_importer.parsers.beatmap_cache import beatmap_cache
+
+    ensure_registered()
+    scene = bpy.context.scene
+    scene.render.fps = fps
+    props = scene.osu_importer_props
+    apply_options(props, options)
+    props.osu_file = osu_file_path
+    props.osr_file = osr_file_path
+
+    def clear_scene():
+        delete_imported_data()
+        bpy.data.orphans_purge(do_recursive=True)
+        beatmap_cache.clear()
+
+    stages = {}
+    try:
+        stages["data_manager"], data_manager = measure(
+            lambda: OsuDataManager(osu_file_path, osr_file_path, props), repeat, setup=beatmap_cache.clear)
+        stages["check_hits"], _ = measure(data_manager.check_hits, repeat)
+
+        config = ImportConfig(props, data_manager)
+        stages["import_plan"], _ = measure(lambda: build_import_plan(data_manager, config), repeat)
+
+        stages["import"], _ = measure(lambda: run_import(props, osu_file_path, osr_file_path), repeat, setup=clear_scene)
+        datablocks = count_datablocks()
+        clear_scene()
+    finally:
+        reset_options(props, options)
+    return stages, datablocks
+
+def compare_to_baseline(results, baseline_path, threshold):
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = {case["name"]: case for case in json.load(file).get("cases", [])}
+
+    regressions = []
+    for case in results["cases"]:
+        previous = baseline.get(case["name"])
+        if not previous:
+            continue
+        for stage, timing in case["stages"].items():
+            previous_timing = previous["stages"].get(stage)
+            if not previous_timing or previous_timing["min_ms"] <= 0:
+                continue
+            ratio = timing["min_ms"] / previous_timing["min_ms"]
+            flag = "  <-- slower" if ratio > 1 + threshold else ""
+            print(f"{case['name']:>14} {stage:<18} {previous_timing['min_ms']:>10.2f} -> {timing['min_ms']:>10.2f} ms ({ratio:.2f}x){flag}")
+            if flag:
+                regressions.append((case["name"], stage, ratio))
+    return regressions
+
+def run_benchmarks(case_names, repeat, workdir, options, fps, seed):
+    load_package()
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "blender": bpy.app.version_string if bpy else None,
+            "platform": platform.platform(),
+        },
+        "repeat": repeat,
+        "fps": fps,
+        "options": options,
+        "cases": [],
+    }
+
+    for name in case_names:
+        params = CASES[name]
+        osu_file_path, osr_file_path, stats = write_case(workdir, name, seed=seed, **params)
+        print(f"[osu! Importer] Benchmark '{name}': {stats}")
+
+        stages, counts = run_standalone_stages(osu_file_path, osr_file_path, repeat)
+        case = {"name": name, "params": params, "stats": stats, "counts": counts, "stages": stages}
+        if bpy is not None:
+            blender_stages, case["datablocks"] = run_blender_stages(osu_file_path, osr_file_path, repeat, options, fps)
+            stages.update(blender_stages)
+
+        for stage, timing in stages.items():
+            print(f"{name:>14} {stage:<18} {timing['min_ms']:>10.2f} ms (mean {timing['mean_ms']:.2f})")
+        results["cases"].append(case)
+
+    return results
+
+def main(argv=None):
+    if argv is None:
+        # Blender keeps its own arguments in sys.argv, the benchmark ones follow "--"
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else ([] if bpy else sys.argv[1:])
+
+    parser = argparse.ArgumentParser(prog="run_benchmarks", description="osu! importer benchmarks on synthetic data")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma separated cases: {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per stage, the minimum is used for comparisons")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--workdir", help="Directory for the generated .osu/.osr files (default: temporary)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=int, default=60, help="Scene frame rate for the Blender stages")
+    parser.add_argument("--import-type", default="BASE", choices=("BASE", "FULL"), help="Import type for the Blender stages")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    case_names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+
+    options = {"import_type": args.import_type}
+    if args.workdir:
+        results = run_benchmarks(case_names, args.repeat, args.workdir, options, args.fps, args.seed)
+    else:
+        with tempfile.TemporaryDirectory(prefix="osu_importer_bench_") as workdir:
+            results = run_benchmarks(case_names, args.repeat, workdir, options, args.fps, args.seed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"[osu! Importer] Benchmark results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"[osu! Importer] {len(regressions)} stage(s) slower than the baseline.")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
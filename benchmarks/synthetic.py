@@ -0,0 +1,188 @@
+# benchmarks/synthetic.py
+#
+# Deterministic synthetic beatmaps and replays for the import benchmarks.
+
+import hashlib
+import lzma
+import os
+import struct
+import numpy as np
+
+CURVE_TYPES = ("B", "P", "L", "C")
+SLIDER_MULTIPLIER = 1.4
+BEAT_LENGTH = 400.0
+REPLAY_VERSION = 20240101
+
+CASES = {
+    "small": {"objects": 200, "slider_ratio": 0.3, "slider_points": 3, "timing_points": 4, "replay_interval": 16},
+    "medium": {"objects": 1000, "slider_ratio": 0.4, "slider_points": 4, "timing_points": 16, "replay_interval": 16},
+    "large": {"objects": 4000, "slider_ratio": 0.4, "slider_points": 4, "timing_points": 64, "replay_interval": 16},
+    "slider_heavy": {"objects": 1000, "slider_ratio": 0.9, "slider_points": 12, "timing_points": 16, "replay_interval": 16},
+    "timing_heavy": {"objects": 1000, "slider_ratio": 0.4, "slider_points": 4, "timing_points": 2000, "replay_interval": 16},
+    "long_replay": {"objects": 1000, "slider_ratio": 0.4, "slider_points": 4, "timing_points": 16, "replay_interval": 2},
+}
+
+def generate_hitobjects(rng, objects, slider_ratio, slider_points):
+    hitobjects = []
+    time = 1000
+    for index in range(objects):
+        x, y = int(rng.integers(0, 513)), int(rng.integers(0, 385))
+        new_combo = 4 if index % 8 == 0 else 0
+        roll = rng.random()
+
+        if roll < 0.01:
+            duration = int(rng.integers(1000, 3000))
+            hitobjects.append({"kind": "spinner", "time": time, "x": 256, "y": 192, "end_time": time + duration,
+                               "line": f"256,192,{time},{8 | new_combo},0,{time + duration}"})
+        elif roll < 0.01 + slider_ratio:
+            curve_type = CURVE_TYPES[index % len(CURVE_TYPES)]
+            point_count = 2 if curve_type == "P" else slider_points
+            offsets = rng.integers(-120, 121, size=(point_count, 2))
+            points = np.clip(np.cumsum(offsets, axis=0) + (x, y), (0, 0), (512, 384)).astype(int)
+            repeats = int(rng.integers(1, 4))
+            length = float(rng.integers(80, 320))
+            duration = int(length / (SLIDER_MULTIPLIER * 100) * BEAT_LENGTH * repeats)
+            curve = "|".join(f"{px}:{py}" for px, py in points)
+            hitobjects.append({"kind": "slider", "time": time, "x": x, "y": y, "end_time": time + duration,
+                               "line": f"{x},{y},{time},{2 | new_combo},0,{curve_type}|{curve},{repeats},{length}"})
+        else:
+            duration = 0
+            hitobjects.append({"kind": "circle", "time": time, "x": x, "y": y, "end_time": time,
+                               "line": f"{x},{y},{time},{1 | new_combo},0,0:0:0:0:"})
+
+        time += duration + int(rng.integers(150, 400))
+    return hitobjects
+
+def generate_timing_points(rng, count, duration):
+    lines = [f"0,{BEAT_LENGTH},4,2,0,60,1,0"]
+    for offset in np.linspace(0, duration, num=count, endpoint=False)[1:]:
+        if rng.random() < 0.1:
+            lines.append(f"{int(offset)},{BEAT_LENGTH},4,2,0,60,1,0")
+        else:
+            lines.append(f"{int(offset)},{-float(rng.integers(50, 200))},4,2,0,60,0,0")
+    return lines
+
+def format_beatmap(hitobjects, timing_points, name):
+    return "\n".join([
+        "osu file format v14",
+        "",
+        "[General]",
+        "AudioFilename: audio.mp3",
+        "AudioLeadIn: 0",
+        "Mode: 0",
+        "",
+        "[Metadata]",
+        f"Title:{name}",
+        "Artist:Synthetic",
+        "Creator:benchmarks",
+        f"Version:{name}",
+        "",
+        "[Difficulty]",
+        "HPDrainRate:5",
+        "CircleSize:4",
+        "OverallDifficulty:8",
+        "ApproachRate:9",
+        f"SliderMultiplier:{SLIDER_MULTIPLIER}",
+        "SliderTickRate:1",
+        "",
+        "[Events]",
+        "0,0,\"bg.jpg\",0,0",
+        "",
+        "[TimingPoints]",
+        *timing_points,
+        "",
+        "[HitObjects]",
+        *(hitobject["line"] for hitobject in hitobjects),
+        "",
+    ])
+
+def generate_replay_frames(rng, hitobjects, interval):
+    # Cursor follows the object positions with some noise, keys alternate between K1 and K2 and are held
+    # from a slightly early/late press until the end of the object
+    object_times = np.array([hitobject["time"] for hitobject in hitobjects], dtype=np.float64)
+    end_times = np.array([hitobject["end_time"] for hitobject in hitobjects], dtype=np.float64)
+    object_xs = np.array([hitobject["x"] for hitobject in hitobjects], dtype=np.float64)
+    object_ys = np.array([hitobject["y"] for hitobject in hitobjects], dtype=np.float64)
+
+    duration = end_times.max() + 1000 if len(end_times) else 1000
+    deltas = np.maximum(interval + rng.integers(-1, 2, size=int(duration / interval) + 1), 1)
+    times = np.cumsum(deltas)
+
+    xs = np.interp(times, object_times, object_xs) + rng.normal(0, 3, size=len(times))
+    ys = np.interp(times, object_times, object_ys) + rng.normal(0, 3, size=len(times))
+
+    press_starts = object_times + rng.normal(0, 15, size=len(object_times))
+    press_ends = np.maximum(end_times, press_starts + 40)
+    press_keys = np.where(np.arange(len(object_times)) % 2 == 0, 5, 10)
+
+    active = np.searchsorted(press_starts, times, side='right') - 1
+    clipped = np.clip(active, 0, None)
+    pressed = (active >= 0) & (times <= press_ends[clipped])
+    keys = np.where(pressed, press_keys[clipped], 0)
+
+    return deltas, xs, ys, keys
+
+def format_replay_frames(deltas, xs, ys, keys, seed):
+    # Stable replays start with two skip frames and end with the RNG seed frame
+    frames = ["0|256|-500|0", "-1|256|-500|0"]
+    frames.extend(f"{delta}|{x:.4f}|{y:.4f}|{key}" for delta, x, y, key in zip(deltas.tolist(), xs.tolist(), ys.tolist(), keys.tolist()))
+    frames.append(f"-12345|0|0|{seed}")
+    return ",".join(frames) + ","
+
+def osr_string(value):
+    data = value.encode('utf-8')
+    length = len(data)
+    encoded = bytearray()
+    while True:
+        byte = length & 0x7F
+        length >>= 7
+        if length:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            break
+    return b"\x0b" + bytes(encoded) + data
+
+def format_replay(beatmap_md5, frame_data, hit_count):
+    compressed = lzma.compress(frame_data.encode('ascii'), format=lzma.FORMAT_ALONE)
+    replay_md5 = hashlib.md5(compressed).hexdigest()
+    return b"".join([
+        struct.pack("<bi", 0, REPLAY_VERSION),
+        osr_string(beatmap_md5),
+        osr_string("benchmark"),
+        osr_string(replay_md5),
+        struct.pack("<hhhhhhih?i", hit_count, 0, 0, 0, 0, 0, hit_count * 300, hit_count, True, 0),
+        osr_string(""),
+        struct.pack("<q", 0),
+        struct.pack("<i", len(compressed)),
+        compressed,
+        struct.pack("<q", 0),
+    ])
+
+def write_case(directory, name, objects, slider_ratio, slider_points, timing_points, replay_interval, seed=0):
+    rng = np.random.default_rng(seed)
+    hitobjects = generate_hitobjects(rng, objects, slider_ratio, slider_points)
+    duration = max(hitobject["end_time"] for hitobject in hitobjects) if hitobjects else 0
+
+    beatmap = format_beatmap(hitobjects, generate_timing_points(rng, timing_points, duration), name).encode('utf-8')
+    deltas, xs, ys, keys = generate_replay_frames(rng, hitobjects, replay_interval)
+    replay = format_replay(hashlib.md5(beatmap).hexdigest(), format_replay_frames(deltas, xs, ys, keys, seed), len(hitobjects))
+
+    os.makedirs(directory, exist_ok=True)
+    osu_file_path = os.path.join(directory, f"{name}.osu")
+    osr_file_path = os.path.join(directory, f"{name}.osr")
+    with open(osu_file_path, 'wb') as file:
+        file.write(beatmap)
+    with open(osr_file_path, 'wb') as file:
+        file.write(replay)
+
+    stats = {
+        "circles": sum(1 for hitobject in hitobjects if hitobject["kind"] == "circle"),
+        "sliders": sum(1 for hitobject in hitobjects if hitobject["kind"] == "slider"),
+        "spinners": sum(1 for hitobject in hitobjects if hitobject["kind"] == "spinner"),
+        "timing_points": timing_points,
+        "replay_frames": len(deltas),
+        "osu_bytes": len(beatmap),
+        "osr_bytes": len(replay),
+    }
+    return osu_file_path, osr_file_path, stats
@@ -0,0 +1,143 @@
+# osu_importer/batch.py
+#
+# Headless batch import, one .blend per replay:
+#   blender -b --python osu_importer/batch.py -- jobs.json [--output-dir DIR]
+#
+# jobs.json:
+#   {
+#     "options": {"import_type": "BASE", "fps": 60, "auto_create_shaders": true},
+#     "output_dir": "renders/blend",
+#     "jobs": [
+#       {"osu_file": "map.osu", "osr_file": "replay.osr", "output": "replay.blend", "options": {...}}
+#     ]
+#   }
+# Options are OSUImporterProperties names; job options override the shared ones.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import bpy
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from osu_importer.exec import create_shaders, run_import
+from osu_importer.delete import delete_imported_data
+
+DEFAULT_FPS = 60
+
+def ensure_registered():
+    if not hasattr(bpy.types.Scene, "osu_importer_props"):
+        import osu_importer
+        osu_importer.register()
+
+def load_jobs(jobs_path):
+    with open(jobs_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    if isinstance(data, list):
+        data = {"jobs": data}
+
+    base_dir = os.path.dirname(os.path.abspath(jobs_path))
+    for job in data.get("jobs", []):
+        for key in ("osu_file", "osr_file", "output"):
+            if job.get(key):
+                job[key] = os.path.join(base_dir, job[key])
+    if data.get("output_dir"):
+        data["output_dir"] = os.path.join(base_dir, data["output_dir"])
+    return data
+
+def apply_options(props, options):
+    for key, value in options.items():
+        if key == "fps":
+            continue
+        if not hasattr(props, key):
+            print(f"[osu! Importer] Unknown import option '{key}', skipping.")
+            continue
+        setattr(props, key, value)
+
+def reset_options(props, options):
+    for key in options:
+        if key != "fps" and hasattr(props, key):
+            props.property_unset(key)
+
+def protect_shared_data():
+    # Node groups and materials are reused by every job; orphan purges must not remove them
+    for datablock in list(bpy.data.node_groups) + list(bpy.data.materials):
+        if datablock.get("osu_imported") or datablock.name.startswith("GN_Osu"):
+            datablock.use_fake_user = True
+
+def get_output_path(job, output_dir):
+    if job.get("output"):
+        return job["output"]
+    replay_name = os.path.splitext(os.path.basename(job["osr_file"]))[0]
+    return os.path.join(output_dir or os.path.dirname(job["osr_file"]), f"{replay_name}.blend")
+
+def run_batch(jobs_path, output_dir=None):
+    ensure_registered()
+
+    data = load_jobs(jobs_path)
+    shared_options = data.get("options", {})
+    jobs = data.get("jobs", [])
+    output_dir = output_dir or data.get("output_dir")
+
+    scene = bpy.context.scene
+    props = scene.osu_importer_props
+
+    if shared_options.get("auto_create_shaders") or any(job.get("options", {}).get("auto_create_shaders") for job in jobs):
+        create_shaders()
+        protect_shared_data()
+
+    failures = 0
+    for index, job in enumerate(jobs, start=1):
+        job_options = dict(shared_options, **job.get("options", {}))
+        print(f"\n[osu! Importer] Batch job {index}/{len(jobs)}: {job.get('osr_file')}")
+
+        try:
+            delete_imported_data(keep_shared=True)
+            bpy.data.orphans_purge(do_recursive=True)
+
+            osu_file_path = job["osu_file"]
+            osr_file_path = job["osr_file"]
+            if not os.path.isfile(osu_file_path) or not os.path.isfile(osr_file_path):
+                raise FileNotFoundError(f"Missing beatmap or replay: {osu_file_path}, {osr_file_path}")
+
+            scene.render.fps = job_options.get("fps", DEFAULT_FPS)
+            apply_options(props, job_options)
+            props.osu_file = osu_file_path
+            props.osr_file = osr_file_path
+
+            start = time.perf_counter()
+            run_import(props, osu_file_path, osr_file_path)
+            print(f"[osu! Importer] Batch job {index} imported in {time.perf_counter() - start:.4f} s")
+            protect_shared_data()
+
+            output_path = get_output_path(job, output_dir)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            bpy.ops.wm.save_as_mainfile(filepath=output_path, copy=True)
+            print(f"[osu! Importer] Saved {output_path}")
+        except Exception as e:
+            failures += 1
+            print(f"[osu! Importer] Batch job {index} failed: {e}")
+        finally:
+            reset_options(props, job_options)
+
+    print(f"\n[osu! Importer] Batch finished: {len(jobs) - failures}/{len(jobs)} jobs succeeded.")
+    return failures
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog="osu_importer.batch", description="Headless osu! beatmap/replay import")
+    parser.add_argument("jobs", help="JSON file with beatmap/replay pairs and import options")
+    parser.add_argument("--output-dir", help="Directory for the .blend files of jobs without an explicit output")
+    args = parser.parse_args(argv)
+
+    failures = run_batch(args.jobs, args.output_dir)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ class ImportConfig:
     def __init__(self, props, data_manager):
         self.import_type = props.import_type
         self.include_osu_gameplay = props.include_osu_gameplay
+        self.instance_hit_objects = props.instance_hit_objects
         self.import_approach_circles = props.import_approach_circles
         self.import_circles = props.import_circles
         self.import_sliders = props.import_sliders
@@ -14,7 +15,10 @@ class ImportConfig:
         self.import_cursors = props.import_cursors
         self.import_audio = props.import_audio
         self.slider_resolution = props.slider_resolution
+        self.adaptive_slider_sampling = props.adaptive_slider_sampling
+        self.slider_tolerance = props.slider_tolerance
         self.cursor_size = props.cursor_size
+        self.cursor_max_error = props.cursor_max_error
         self.cursor_shape = props.cursor_shape
         self.approach_circle_bevel_depth = props.approach_circle_bevel_depth
         self.approach_circle_bevel_resolution = props.approach_circle_bevel_resolution
@@ -31,6 +35,15 @@ class ImportConfig:
         self.ms_per_frame = data_manager.ms_per_frame
         self.speed_multiplier = data_manager.speed_multiplier
 
+        self.time_window = None
+        if props.use_time_window:
+            if props.time_window_unit == 'SECONDS':
+                fps = 1000 / data_manager.ms_per_frame
+                first_frame, last_frame = props.time_window_start * fps, props.time_window_end * fps
+            else:
+                first_frame, last_frame = props.time_window_start, props.time_window_end
+            self.time_window = (int(first_frame), int(last_frame))
+
         self.beatmap_info = data_manager.beatmap_info
         self.replay_info = data_manager.replay_info
 
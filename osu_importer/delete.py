@@ -2,6 +2,34 @@
 
 import bpy
 
+def delete_imported_data(keep_shared=False):
+    warnings = []
+
+    data_collections = [
+        ("object", bpy.data.objects),
+        ("collection", bpy.data.collections),
+        ("sound", bpy.data.sounds),
+    ]
+    if not keep_shared:
+        data_collections += [
+            ("node group", bpy.data.node_groups),
+            ("material", bpy.data.materials),
+        ]
+
+    for label, data_collection in data_collections:
+        to_delete = [datablock for datablock in data_collection if datablock.get("osu_imported")]
+        for datablock in to_delete:
+            name = datablock.name
+            try:
+                if label == "object":
+                    data_collection.remove(datablock, do_unlink=True)
+                else:
+                    data_collection.remove(datablock)
+            except Exception as e:
+                warnings.append(f"Failed to delete {label} {name}: {e}")
+
+    return warnings
+
 class OSU_OT_Delete(bpy.types.Operator):
     bl_idname = "osu_importer.delete"
     bl_label = "Delete Imported Data"
@@ -9,53 +37,8 @@ class OSU_OT_Delete(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            objects_to_delete = [obj for obj in bpy.data.objects if obj.get("osu_imported")]
-            for obj in objects_to_delete:
-                try:
-                    bpy.data.objects.remove(obj, do_unlink=True)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Failed to delete object {obj.name}: {e}")
-
-            collections_to_delete = [
-                collection for collection in bpy.data.collections
-                if collection.get("osu_imported")
-            ]
-            for collection in collections_to_delete:
-                try:
-                    bpy.data.collections.remove(collection)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Failed to delete collection {collection.name}: {e}")
-
-            node_groups_to_delete = [
-                gn_tree for gn_tree in bpy.data.node_groups
-                if gn_tree.get("osu_imported")
-            ]
-            for gn_tree in node_groups_to_delete:
-                try:
-                    bpy.data.node_groups.remove(gn_tree)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Failed to delete node group {gn_tree.name}: {e}")
-
-            sounds_to_delete = [
-                sound for sound in bpy.data.sounds
-                if sound.get("osu_imported")
-            ]
-            for sound in sounds_to_delete:
-                try:
-                    bpy.data.sounds.remove(sound)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Failed to delete sound {sound.name}: {e}")
-
-            materials_to_delete = [
-                material for material in bpy.data.materials
-                if material.get("osu_imported")
-            ]
-            for material in materials_to_delete:
-                try:
-                    bpy.data.materials.remove(material)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Failed to delete material {material.name}: {e}")
-
+            for warning in delete_imported_data():
+                self.report({'WARNING'}, warning)
 
             bpy.ops.outliner.orphans_purge(do_recursive=True)
 
@@ -2,11 +2,30 @@
 
 import bpy
 import os
+import time
 from .osu_data_manager import OsuDataManager
 from .import_objects import import_hitobjects
-from .utils.utils import timeit
+from .utils.utils import get_profile_output_dir
+from .utils.profiling import profiler
 from .config import ImportConfig
 
+def create_shaders():
+    from .shader_nodes.basic_circle import circles_node_group
+    from .shader_nodes.basic_slider import slider_node_group
+    from .shader_nodes.basic_slider_ball import slider_balls_node_group
+    from .shader_nodes.basic_approach_circle import approach_circles_node_group
+    from .shader_nodes.basic_cursor import cursor_node_group
+    from .shader_nodes.basic_spinner import spinner_node_group
+
+    circles_node_group()
+    slider_node_group()
+    slider_balls_node_group()
+    approach_circles_node_group()
+    cursor_node_group()
+    spinner_node_group()
+
+    print("Shaders created successfully.")
+
 def main_execution(context):
     props = context.scene.osu_importer_props
     osu_file_path = bpy.path.abspath(props.osu_file)
@@ -22,21 +41,7 @@ def main_execution(context):
 
     if props.auto_create_shaders:
         try:
-            from .shader_nodes.basic_circle import circles_node_group
-            from .shader_nodes.basic_slider import slider_node_group
-            from .shader_nodes.basic_slider_ball import slider_balls_node_group
-            from .shader_nodes.basic_approach_circle import approach_circles_node_group
-            from .shader_nodes.basic_cursor import cursor_node_group
-            from .shader_nodes.basic_spinner import spinner_node_group
-
-            circles_node_group()
-            slider_node_group()
-            slider_balls_node_group()
-            approach_circles_node_group()
-            cursor_node_group()
-            spinner_node_group()
-
-            print("Shaders created successfully.")
+            create_shaders()
         except Exception as e:
             context.window_manager.popup_menu(
                 lambda self, ctx: self.layout.label(text=f"Error creating shaders: {str(e)}"),
@@ -45,24 +50,49 @@ def main_execution(context):
             )
             return {'CANCELLED'}, None
 
-    with timeit("OsuDataManager Initialisierung"):
+    data_manager = run_import(props, osu_file_path, osr_file_path)
+
+    return {'FINISHED'}, data_manager
+
+def run_import(props, osu_file_path, osr_file_path, operator=None):
+    if props.enable_profiling:
+        profiler.start("Import", use_cprofile=props.profile_with_cprofile,
+                       osu_file=osu_file_path, osr_file=osr_file_path)
+    try:
+        return import_files(props, osu_file_path, osr_file_path, operator)
+    finally:
+        if profiler.enabled:
+            profiler.stop()
+            profiler.print_summary()
+            basename = f"{os.path.splitext(os.path.basename(osr_file_path))[0]}_{time.strftime('%Y%m%d-%H%M%S')}"
+            try:
+                report_path, trace_path = profiler.export(get_profile_output_dir(props), basename)
+                print(f"[osu! Importer] Profile written to {report_path} and {trace_path}")
+            except OSError as e:
+                print(f"[osu! Importer] Error writing profile: {e}")
+
+def import_files(props, osu_file_path, osr_file_path, operator=None):
+    with profiler.span("Loading beatmap and replay"):
         data_manager = OsuDataManager(osu_file_path, osr_file_path, props)
 
     data_manager.print_all_info()
 
     config = ImportConfig(props, data_manager)
 
+    if config.time_window:
+        data_manager.apply_time_window(*config.time_window)
+
     if config.import_audio:
-        with timeit("Audio Importieren"):
+        with profiler.span("Importing audio"):
             data_manager.import_audio()
 
-    with timeit("Hits Überprüfen"):
+    with profiler.span("Checking hits"):
         data_manager.check_hits()
 
-    with timeit("Hitobjects Importieren"):
-        import_hitobjects(data_manager, config)
+    with profiler.span("Importing hit objects"):
+        import_hitobjects(data_manager, config, operator)
 
-    with timeit("Frame-Range Setzen"):
+    with profiler.span("Setting frame range"):
         scene = bpy.context.scene
         anim_objects = [obj for obj in bpy.data.objects if obj.animation_data and obj.animation_data.action]
         if anim_objects:
@@ -71,4 +101,4 @@ def main_execution(context):
             scene.frame_end = int(
                 max([action.frame_range[1] for obj in anim_objects for action in [obj.animation_data.action]]))
 
-    return {'FINISHED'}, data_manager
+    return data_manager
@@ -1,98 +1,113 @@
 # osu_importer/geo_nodes/geometry_nodes.py
 
 import bpy
-from osu_importer.utils.utils import timeit, tag_imported
+from osu_importer.utils.utils import tag_imported
+from osu_importer.utils.profiling import profiler
+from osu_importer.utils.fcurves import get_or_create_action, modifier_socket_path, write_fcurve, TrackBuilder
+
+NODE_DEFINITIONS = {
+    "circle": {
+        "name": "Geometry Nodes Circle",
+        "attributes": {
+            "show": 'BOOLEAN',
+            "was_hit": 'BOOLEAN',
+            "ar": 'FLOAT',
+            "cs": 'FLOAT',
+            "combo": 'INT',
+            "combo_color_idx": 'INT',
+            "combo_color": 'FLOAT_VECTOR'
+        }
+    },
+    "slider": {
+        "name": "Geometry Nodes Slider",
+        "attributes": {
+            "show": ('BOOLEAN', 'CURVE'),
+            "slider_duration_ms": ('FLOAT', 'CURVE'),
+            "slider_duration_frames": ('FLOAT', 'CURVE'),
+            "ar": ('FLOAT', 'CURVE'),
+            "cs": ('FLOAT', 'CURVE'),
+            "was_hit": ('BOOLEAN', 'CURVE'),
+            "was_completed": ('BOOLEAN', 'CURVE'),
+            "repeat_count": ('INT', 'CURVE'),
+            "pixel_length": ('FLOAT', 'CURVE'),
+            "combo": ('INT', 'CURVE'),
+            "combo_color_idx": ('INT', 'CURVE'),
+            "combo_color": ('FLOAT_VECTOR', 'CURVE'),
+            "repeat_counter": ('INT', 'CURVE'),
+        }
+    },
+    "slider_head_tail": {
+        "name": "Geometry Nodes Head Tail",
+        "attributes": {
+            "show": 'BOOLEAN',
+            "scale": 'FLOAT',
+            "cs": 'FLOAT',
+            "combo": 'INT',
+            "combo_color_idx": 'INT',
+            "combo_color": 'FLOAT_VECTOR',
+        }
+    },
+    "spinner": {
+        "name": "Geometry Nodes Spinner",
+        "attributes": {
+            "show": 'BOOLEAN',
+            "spinner_duration_ms": 'FLOAT',
+            "spinner_duration_frames": 'FLOAT',
+            "was_hit": 'BOOLEAN',
+            "was_completed": 'BOOLEAN'
+        }
+    },
+    "cursor": {
+        "name": "Geometry Nodes Cursor",
+        "attributes": {
+            "k1": 'BOOLEAN',
+            "k2": 'BOOLEAN',
+            "m1": 'BOOLEAN',
+            "m2": 'BOOLEAN',
+            "cursor_size": 'FLOAT'
+        }
+    },
+    "slider_ball": {
+        "name": "Geometry Nodes Slider Ball",
+        "attributes": {
+            "show": 'BOOLEAN'
+        }
+    },
+    "approach_circle": {
+        "name": "Geometry Nodes Approach Circle",
+        "attributes": {
+            "show": 'BOOLEAN',
+            "scale": 'FLOAT',
+            "cs": 'FLOAT'
+        }
+    },
+}
 
 node_groups = {}
 
-def setup_geometry_node_trees():
-    global node_groups
-    with timeit("Setup Geometry Node Trees"):
-        node_definitions = {
-            "circle": {
-                "name": "Geometry Nodes Circle",
-                "attributes": {
-                    "show": 'BOOLEAN',
-                    "was_hit": 'BOOLEAN',
-                    "ar": 'FLOAT',
-                    "cs": 'FLOAT',
-                    "combo": 'INT',
-                    "combo_color_idx": 'INT',
-                    "combo_color": 'FLOAT_VECTOR'
-                }
-            },
-            "slider": {
-                "name": "Geometry Nodes Slider",
-                "attributes": {
-                    "show": ('BOOLEAN', 'CURVE'),
-                    "slider_duration_ms": ('FLOAT', 'CURVE'),
-                    "slider_duration_frames": ('FLOAT', 'CURVE'),
-                    "ar": ('FLOAT', 'CURVE'),
-                    "cs": ('FLOAT', 'CURVE'),
-                    "was_hit": ('BOOLEAN', 'CURVE'),
-                    "was_completed": ('BOOLEAN', 'CURVE'),
-                    "repeat_count": ('INT', 'CURVE'),
-                    "pixel_length": ('FLOAT', 'CURVE'),
-                    "combo": ('INT', 'CURVE'),
-                    "combo_color_idx": ('INT', 'CURVE'),
-                    "combo_color": ('FLOAT_VECTOR', 'CURVE'),
-                    "repeat_counter": ('INT', 'CURVE'),
-                }
-            },
-            "slider_head_tail": {
-                "name": "Geometry Nodes Head Tail",
-                "attributes": {
-                    "show": 'BOOLEAN',
-                    "scale": 'FLOAT',
-                    "cs": 'FLOAT',
-                    "combo": 'INT',
-                    "combo_color_idx": 'INT',
-                    "combo_color": 'FLOAT_VECTOR',
-                }
-            },
-            "spinner": {
-                "name": "Geometry Nodes Spinner",
-                "attributes": {
-                    "show": 'BOOLEAN',
-                    "spinner_duration_ms": 'FLOAT',
-                    "spinner_duration_frames": 'FLOAT',
-                    "was_hit": 'BOOLEAN',
-                    "was_completed": 'BOOLEAN'
-                }
-            },
-            "cursor": {
-                "name": "Geometry Nodes Cursor",
-                "attributes": {
-                    "k1": 'BOOLEAN',
-                    "k2": 'BOOLEAN',
-                    "m1": 'BOOLEAN',
-                    "m2": 'BOOLEAN',
-                    "cursor_size": 'FLOAT'
-                }
-            },
-            "slider_ball": {
-                "name": "Geometry Nodes Slider Ball",
-                "attributes": {
-                    "show": 'BOOLEAN'
-                }
-            },
-            "approach_circle": {
-                "name": "Geometry Nodes Approach Circle",
-                "attributes": {
-                    "show": 'BOOLEAN',
-                    "scale": 'FLOAT',
-                    "cs": 'FLOAT'
-                }
-            },
-        }
+def is_node_group_valid(node_group):
+    try:
+        return bpy.data.node_groups.get(node_group.name) == node_group
+    except ReferenceError:
+        return False
+
+def get_geometry_node_tree(obj_type):
+    node_group = node_groups.get(obj_type)
+    if node_group is not None and is_node_group_valid(node_group):
+        return node_group
+
+    node_def = NODE_DEFINITIONS.get(obj_type)
+    if node_def is None:
+        return None
 
-        for key, node_def in node_definitions.items():
-            name = node_def["name"]
-            attributes = node_def["attributes"]
-            node_group = bpy.data.node_groups.get(name)
-            if node_group is None:
-                node_group = create_geometry_nodes_tree(name, attributes)
-            node_groups[key] = node_group
+    node_group = create_geometry_nodes_tree(node_def["name"], node_def["attributes"])
+    node_groups[obj_type] = node_group
+    return node_group
+
+def setup_geometry_node_trees():
+    with profiler.span("Setup Geometry Node Trees"):
+        for key in NODE_DEFINITIONS:
+            get_geometry_node_tree(key)
 
 def create_geometry_nodes_tree(name, attributes):
     if name in bpy.data.node_groups:
@@ -145,10 +160,102 @@ def setup_node_group_interface(group, attributes):
 
     group.links.new(previous_node_output, output_node.inputs['Geometry'])
 
-def create_geometry_nodes_modifier(obj, obj_type):
-    setup_geometry_node_trees()
+INSTANCED_NODE_GROUP_NAME = "Geometry Nodes Instanced Hit Objects"
 
-    node_group = node_groups.get(obj_type)
+def create_instanced_hit_objects_tree():
+    group = bpy.data.node_groups.get(INSTANCED_NODE_GROUP_NAME)
+    if group is not None:
+        return group
+
+    group = bpy.data.node_groups.new(INSTANCED_NODE_GROUP_NAME, 'GeometryNodeTree')
+    group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = group.nodes
+    links = group.links
+
+    input_node = nodes.new('NodeGroupInput')
+    input_node.location = (0, 0)
+    scene_time = nodes.new('GeometryNodeInputSceneTime')
+    scene_time.location = (0, -200)
+    frame = scene_time.outputs['Frame']
+
+    def named_attribute(name, data_type, y):
+        node = nodes.new('GeometryNodeInputNamedAttribute')
+        node.location = (200, y)
+        node.data_type = data_type
+        node.inputs['Name'].default_value = name
+        return node.outputs[0]
+
+    def compare(a, b, operation, y):
+        node = nodes.new('FunctionNodeCompare')
+        node.location = (400, y)
+        node.data_type = 'FLOAT'
+        node.operation = operation
+        links.new(a, node.inputs[0])
+        links.new(b, node.inputs[1])
+        return node.outputs['Result']
+
+    def boolean_math(operation, a, b, y):
+        node = nodes.new('FunctionNodeBooleanMath')
+        node.location = (600, y)
+        node.operation = operation
+        links.new(a, node.inputs[0])
+        if b is not None:
+            links.new(b, node.inputs[1])
+        return node.outputs[0]
+
+    early_start_frame = named_attribute("early_start_frame", 'FLOAT', -200)
+    start_frame = named_attribute("start_frame", 'FLOAT', -400)
+    end_frame = named_attribute("end_frame", 'FLOAT', -600)
+    hide_at_end = named_attribute("hide_at_end", 'BOOLEAN', -800)
+    judged_hit = named_attribute("judged_hit", 'BOOLEAN', -1000)
+    judged_completed = named_attribute("judged_completed", 'BOOLEAN', -1200)
+
+    after_early_start = compare(frame, early_start_frame, 'GREATER_EQUAL', -200)
+    after_start = compare(frame, start_frame, 'GREATER_EQUAL', -400)
+    after_end = compare(frame, end_frame, 'GREATER_EQUAL', -600)
+
+    ended = boolean_math('AND', after_end, hide_at_end, -600)
+    not_ended = boolean_math('NOT', ended, None, -700)
+
+    fields = {
+        "show": boolean_math('AND', after_early_start, not_ended, -200),
+        "was_hit": boolean_math('AND', after_start, judged_hit, -1000),
+        "was_completed": boolean_math('AND', after_end, judged_completed, -1200),
+    }
+
+    map_range = nodes.new('ShaderNodeMapRange')
+    map_range.location = (600, -1400)
+    map_range.data_type = 'FLOAT'
+    map_range.clamp = True
+    links.new(frame, map_range.inputs[0])
+    links.new(early_start_frame, map_range.inputs[1])
+    links.new(start_frame, map_range.inputs[2])
+    map_range.inputs[3].default_value = 4.0
+    map_range.inputs[4].default_value = 1.0
+    fields["scale"] = map_range.outputs[0]
+
+    previous_node_output = input_node.outputs['Geometry']
+    for i, (attr_name, field) in enumerate(fields.items()):
+        store_node = nodes.new('GeometryNodeStoreNamedAttribute')
+        store_node.location = (800 + 200 * i, 0)
+        store_node.data_type = 'FLOAT' if attr_name == "scale" else 'BOOLEAN'
+        store_node.domain = 'POINT'
+        store_node.inputs['Name'].default_value = attr_name
+        links.new(previous_node_output, store_node.inputs['Geometry'])
+        links.new(field, store_node.inputs['Value'])
+        previous_node_output = store_node.outputs['Geometry']
+
+    output_node = nodes.new('NodeGroupOutput')
+    output_node.location = (800 + 200 * len(fields), 0)
+    links.new(previous_node_output, output_node.inputs['Geometry'])
+
+    tag_imported(group)
+    return group
+
+def create_geometry_nodes_modifier(obj, obj_type):
+    node_group = get_geometry_node_tree(obj_type)
     if not node_group:
         print(f"Unrecognized object type for {obj_type}. Skipping modifier setup.")
         return
@@ -165,6 +272,8 @@ def set_modifier_inputs_with_keyframes(obj, attributes, frame_values, fixed_valu
         print(f"No GeometryNodes modifier found on object '{obj.name}'.")
         return
 
+    tracks = TrackBuilder()
+
     for i, (attr_name, attr_info) in enumerate(attributes.items()):
         if isinstance(attr_info, tuple):
             attr_type = attr_info[0]
@@ -175,19 +284,13 @@ def set_modifier_inputs_with_keyframes(obj, attributes, frame_values, fixed_valu
         socket_count = f"Socket_{socket_index}"
 
         if attr_name in frame_values:
-            for frame, value in frame_values[attr_name]:
-                try:
-                    if attr_type == 'BOOLEAN':
-                        modifier[socket_count] = bool(value)
-                    elif attr_type == 'FLOAT':
-                        modifier[socket_count] = float(value)
-                    elif attr_type == 'INT':
-                        modifier[socket_count] = int(value)
-                    elif attr_type == 'FLOAT_VECTOR':
-                        modifier[socket_count] = tuple(float(v) for v in value)
-                    modifier.keyframe_insert(data_path=f'["{socket_count}"]', frame=frame)
-                except Exception as e:
-                    print(f"Error setting keyframes for '{attr_name}' on socket '{socket_count}': {e}")
+            data_path = modifier_socket_path(modifier, socket_count)
+            if attr_type in ('BOOLEAN', 'INT'):
+                tracks.step(data_path, frame_values[attr_name])
+            elif attr_type == 'FLOAT_VECTOR':
+                tracks.vector(data_path, frame_values[attr_name])
+            else:
+                tracks.linear(data_path, frame_values[attr_name])
         elif fixed_values and attr_name in fixed_values:
             try:
                 value = fixed_values[attr_name]
@@ -199,11 +302,41 @@ def set_modifier_inputs_with_keyframes(obj, attributes, frame_values, fixed_valu
                     modifier[socket_count] = int(value)
                 elif attr_type == 'FLOAT_VECTOR':
                     modifier[socket_count] = tuple(float(v) for v in value)
-                print(f"Set fixed value for '{attr_name}' on socket '{socket_count}' to {value}")
+                profiler.count("rna_calls")
             except Exception as e:
                 print(f"Error setting fixed value for '{attr_name}' on socket '{socket_count}': {e}")
+
+    try:
+        tracks.write(obj)
+    except Exception as e:
+        print(f"Error writing keyframes for '{obj.name}': {e}")
+
+def set_modifier_inputs_with_fcurves(obj, attributes, frame_values):
+    modifier = obj.modifiers.get("GeometryNodes")
+    if not modifier:
+        print(f"No GeometryNodes modifier found on object '{obj.name}'.")
+        return
+
+    action = get_or_create_action(obj)
+
+    for i, (attr_name, attr_info) in enumerate(attributes.items()):
+        if attr_name not in frame_values:
+            continue
+
+        if isinstance(attr_info, tuple):
+            attr_type = attr_info[0]
         else:
-            print(f"No values provided for attribute '{attr_name}'. Skipping.")
+            attr_type = attr_info
+
+        socket_count = f"Socket_{i + 2}"  # +2 to account for the two geometry sockets
+        frames, values = frame_values[attr_name]
+        interpolation = 'CONSTANT' if attr_type in ('BOOLEAN', 'INT') else 'LINEAR'
+
+        try:
+            write_fcurve(action, modifier_socket_path(modifier, socket_count), frames, values,
+                         interpolation=interpolation)
+        except Exception as e:
+            print(f"Error writing F-Curve for '{attr_name}' on socket '{socket_count}': {e}")
 
 def assign_collections_to_sockets(obj, socket_to_collection, operator=None):
     modifier = obj.modifiers.get("GeometryNodes")
@@ -218,7 +351,6 @@ def assign_collections_to_sockets(obj, socket_to_collection, operator=None):
         try:
             if socket_name in modifier:
                 modifier[socket_name] = collection
-                print(f"Assigned collection '{collection.name}' to '{socket_name}'.")
             else:
                 error_message = f"Socket '{socket_name}' not found in modifier 'GeometryNodes'."
                 if operator:
@@ -6,8 +6,13 @@ from osu_importer.objects.spinner import SpinnerCreator
 from osu_importer.objects.cursor import CursorCreator
 from osu_importer.objects.approach_circle import ApproachCircleCreator
 from osu_importer.objects.slider_head_tail import SliderHeadTailCreator
-from .utils.utils import create_collection, timeit, tag_imported
-from osu_importer.geo_nodes.geometry_nodes import assign_collections_to_sockets
+from osu_importer.objects.slider_balls import SliderBallCreator
+from osu_importer.objects.slider_ticks import SliderTickCreator
+from osu_importer.objects.instanced import InstancedHitObjectsCreator
+from osu_importer.import_plan import build_import_plan, validate_plan, summarize_plan
+from .utils.utils import create_collection, tag_imported
+from .utils.profiling import profiler
+from osu_importer.geo_nodes.geometry_nodes import assign_collections_to_sockets, setup_geometry_node_trees
 from osu_importer.geo_nodes.geometry_nodes_osu_instance import gn_osu_node_group
 import bpy
 
@@ -64,10 +69,11 @@ def setup_osu_gameplay_collections_and_materials(
             if col != gameplay_collection:
                 col.objects.unlink(cube)
 
-    gn_osu_node_group()
-
     node_group_name = "GN_Osu"
     node_group = bpy.data.node_groups.get(node_group_name)
+    if not node_group:
+        gn_osu_node_group()
+        node_group = bpy.data.node_groups.get(node_group_name)
     if not node_group:
         error_message = f"Node Group '{node_group_name}' not found. Please create it first."
         if operator:
@@ -111,8 +117,50 @@ def setup_osu_gameplay_collections_and_materials(
 
     return gameplay_collection
 
+SPEC_CREATORS = {
+    "circle": CircleCreator,
+    "slider": SliderCreator,
+    "slider_ball": SliderBallCreator,
+    "slider_tick": SliderTickCreator,
+    "spinner": SpinnerCreator,
+    "approach_circle": ApproachCircleCreator,
+    "slider_head_tail": SliderHeadTailCreator,
+}
+
+def materialize_spec(spec, collections, config, data_manager, created):
+    collection = collections.get(spec.collection)
+
+    if spec.kind == "instanced":
+        return InstancedHitObjectsCreator(
+            hitobjects=list(spec.extras["hitobjects"]),
+            object_type=spec.extras["object_type"],
+            collection=collection,
+            config=config,
+            data_manager=data_manager
+        ).create()
+
+    if spec.kind == "cursor":
+        cursor_creator = CursorCreator(
+            cursor_collection=collection,
+            settings=config,
+            data_manager=data_manager,
+            import_type=config.import_type
+        )
+        cursor_creator.animate_cursor()
+        return cursor_creator.cursor
+
+    creator_class = SPEC_CREATORS[spec.kind]
+    creator = creator_class(spec, collection, config, parent=created.get(spec.parent))
+    return creator.create()
+
+def materialize_plan(plan, collections, config, data_manager):
+    created = {}
+    for spec in plan:
+        created[spec.name] = materialize_spec(spec, collections, config, data_manager, created)
+    return created
+
 def import_hitobjects(data_manager, config, operator=None):
-    with timeit("Setting up collections"):
+    with profiler.span("Setting up collections"):
         collections = {
             "Circles": create_collection("Circles") if config.import_circles else None,
             "Sliders": create_collection("Sliders") if config.import_sliders else None,
@@ -127,113 +175,18 @@ def import_hitobjects(data_manager, config, operator=None):
             if collection:
                 tag_imported(collection)
 
-        global_index = 1
+    with profiler.span("Planning import"):
+        plan = validate_plan(build_import_plan(data_manager, config))
+    print(f"Import plan: {dict(summarize_plan(plan))}")
 
-    strategy = get_import_strategy(config.import_type)
-
-    # Circles
-    if config.import_circles:
-        circles = data_manager.hitobjects_processor.circles
-        for hitobject in circles:
-            circle_creator = CircleCreator(
-                hitobject=hitobject,
-                global_index=global_index,
-                collection=collections["Circles"],
-                config=config,
-                data_manager=data_manager,
-                import_type=config.import_type
-            )
-            circle_creator.create()
-            global_index += 1
-            print(f"Circle combo {hitobject.combo_number} and color {hitobject.combo_color}")
-
-    # Sliders
-    slider_balls_collection = collections["Slider Balls"] if config.import_slider_balls else None
-    sliders_collection = collections["Sliders"] if config.import_sliders else None
-
-    if config.import_sliders:
-        sliders = data_manager.hitobjects_processor.sliders
-        for hitobject in sliders:
-            slider_creator = SliderCreator(
-                hitobject=hitobject,
-                global_index=global_index,
-                collection=collections["Sliders"],
-                config=config,
-                data_manager=data_manager,
-                import_type=config.import_type,
-                slider_balls_collection=slider_balls_collection,
-                sliders_collection=sliders_collection
-            )
-            slider_creator.create()
-            global_index += 1
-
-    # Spinners
-    if config.import_spinners:
-        spinners = data_manager.hitobjects_processor.spinners
-        for hitobject in spinners:
-            spinner_creator = SpinnerCreator(
-                hitobject=hitobject,
-                global_index=global_index,
-                collection=collections["Spinners"],
-                config=config,
-                data_manager=data_manager,
-                import_type=config.import_type
-            )
-            spinner_creator.create()
-            global_index += 1
-
-    # Approach Circles
-    if config.import_approach_circles:
-        relevant_hitobjects = data_manager.hitobjects_processor.circles + data_manager.hitobjects_processor.sliders
-        for hitobject in relevant_hitobjects:
-            approach_creator = ApproachCircleCreator(
-                hitobject=hitobject,
-                global_index=global_index,
-                approach_circles_collection=collections["Approach Circles"],
-                config=config,
-                data_manager=data_manager,
-                import_type=config.import_type
-            )
-            approach_creator.create_approach_circle()
-            global_index += 1
-
-    # Cursor
-    if config.import_cursors:
-        cursor_creator = CursorCreator(
-            cursor_collection=collections["Cursor"],
-            settings=config,
-            data_manager=data_manager,
-            import_type=config.import_type
-        )
-        cursor_creator.animate_cursor()
+    if config.import_type == 'BASE':
+        setup_geometry_node_trees()
 
-    # Slider Heads & Tails
-    if config.import_sliders and config.import_slider_heads_tails and config.import_type == 'FULL':
-        sliders = data_manager.hitobjects_processor.sliders
-        for hitobject in sliders:
-            head_creator = SliderHeadTailCreator(
-                hitobject=hitobject,
-                position=hitobject.start_pos,
-                global_index=global_index,
-                slider_heads_tails_collection=collections["Slider Heads Tails"],
-                config=config,
-                data_manager=data_manager,
-                import_type=config.import_type
-            )
-            head_creator.create_slider_head_tail()
-            global_index += 1
-
-            tail_creator = SliderHeadTailCreator(
-                hitobject=hitobject,
-                position=hitobject.end_pos,
-                global_index=global_index,
-                slider_heads_tails_collection=collections["Slider Heads Tails"],
-                config=config,
-                data_manager=data_manager,
-                import_type=config.import_type
-            )
-            tail_creator.create_slider_head_tail()
-            global_index += 1
+    with profiler.span("Materializing import plan"):
+        materialize_plan(plan, collections, config, data_manager)
 
+    strategy = get_import_strategy(config.import_type)
     if strategy.should_include_osu_gameplay(config):
         strategy.setup_osu_gameplay(data_manager, config, config, collections, operator)
+
+    return plan
@@ -0,0 +1,449 @@
+# osu_importer/import_plan.py
+
+from collections import namedtuple, Counter
+from types import MappingProxyType
+import numpy as np
+from osu_importer.utils.constants import SCALE_FACTOR, SPINNER_CENTER_X, SPINNER_CENTER_Y
+from osu_importer.utils.coordinates import map_osu_to_blender, map_osu_to_blender_array
+from osu_importer.utils.slider_curves import build_slider_path
+
+ObjectSpec = namedtuple("ObjectSpec", [
+    "kind",          # circle, slider, slider_ball, slider_tick, spinner, approach_circle, slider_head_tail, cursor, instanced
+    "name",
+    "collection",    # key into the collections dict of import_hitobjects
+    "location",
+    "hitobject",
+    "attributes",    # Geometry Nodes socket types, in socket order
+    "frame_values",  # attribute -> ((frame, value), ...)
+    "fixed_values",
+    "visibility",    # ((frame, hidden), ...) for hide_viewport/hide_render in FULL imports
+    "parent",        # name of the spec this object depends on
+    "extras",
+])
+
+INSTANCED_OBJECT_NAMES = {
+    "circle": "Circles_Instanced",
+    "spinner": "Spinners_Instanced",
+    "approach_circle": "Approach_Circles_Instanced",
+}
+
+SLIDER_TICK_INTERVAL_MS = 100
+
+def freeze(mapping):
+    if mapping is None:
+        return MappingProxyType({})
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in mapping.items()
+    })
+
+def make_spec(kind, name, collection, location=None, hitobject=None, attributes=None, frame_values=None,
+              fixed_values=None, visibility=(), parent=None, extras=None):
+    return ObjectSpec(
+        kind=kind,
+        name=name,
+        collection=collection,
+        location=tuple(location) if location is not None else None,
+        hitobject=hitobject,
+        attributes=freeze(attributes),
+        frame_values=freeze(frame_values),
+        fixed_values=freeze(fixed_values),
+        visibility=tuple(visibility),
+        parent=parent,
+        extras=freeze(extras),
+    )
+
+def visibility_track(show_frame, hide_frame, hidden_at_end=True):
+    return (
+        (int(show_frame - 1), True),
+        (int(show_frame), False),
+        (int(hide_frame), hidden_at_end),
+    )
+
+def get_keyframe_values(hitobject, object_type, import_type, start_frame, end_frame, early_start_frame, approach_rate,
+                        osu_radius, extra_params=None, ms_per_frame=None, audio_lead_in_frames=None):
+    frame_values = {}
+    fixed_values = {}
+
+    frame_values["show"] = [
+        (int(early_start_frame - 1), False),
+        (int(early_start_frame), True),
+    ]
+    frame_values["was_hit"] = [
+        (int(start_frame - 1), False),
+        (int(start_frame), hitobject.was_hit)
+    ]
+
+    fixed_values["ar"] = approach_rate
+    fixed_values["cs"] = osu_radius * SCALE_FACTOR * (2 if import_type == 'BASE' else 1)
+
+    if object_type == 'circle':
+        if import_type == 'FULL':
+            frame_values["show"].append((int(start_frame + 1), False))
+    elif object_type == 'slider':
+        frame_values["show"].extend([
+            (int(end_frame - 1), True),
+            (int(end_frame), False)
+        ])
+        slider_end_frame = (hitobject.slider_end_time / ms_per_frame) + audio_lead_in_frames
+        frame_values["was_completed"] = [
+            (int(slider_end_frame - 1), False),
+            (int(slider_end_frame), True)
+        ]
+        if extra_params:
+            fixed_values.update(extra_params)
+            repeat_counter_keyframes = fixed_values.pop("repeat_counter_keyframes", None)
+            if repeat_counter_keyframes is not None:
+                frame_values["repeat_counter"] = repeat_counter_keyframes
+
+    elif object_type == 'spinner':
+        frame_values["was_completed"] = [
+            (int(end_frame - 1), False),
+            (int(end_frame), True)
+        ]
+        if extra_params:
+            fixed_values.update(extra_params)
+
+    if import_type == 'BASE' and object_type != 'circle':
+        frame_values["show"] = [
+            (int(early_start_frame - 1), False),
+            (int(early_start_frame), True),
+            (int(end_frame - 1), True),
+            (int(end_frame), False)
+        ]
+
+    return frame_values, fixed_values
+
+def combo_values(hitobject):
+    if hitobject.combo_number is None:
+        return {}
+    return {
+        "combo": hitobject.combo_number,
+        "combo_color": hitobject.combo_color,
+        "combo_color_idx": hitobject.combo_color_idx,
+    }
+
+class ImportPlanner:
+    def __init__(self, data_manager, config):
+        self.data_manager = data_manager
+        self.config = config
+        self.import_type = config.import_type
+        self.instanced = config.import_type == 'BASE' and config.instance_hit_objects
+        self.global_index = 1
+        self.slider_ends = {}
+        self.specs = []
+
+    def plan(self):
+        config = self.config
+        processor = self.data_manager.hitobjects_processor
+
+        if config.import_circles:
+            if self.instanced:
+                self.plan_instanced(processor.circles, "circle", "Circles")
+            else:
+                for hitobject in processor.circles:
+                    self.plan_circle(hitobject)
+
+        if config.import_sliders:
+            for hitobject in processor.sliders:
+                self.plan_slider(hitobject)
+
+        if config.import_spinners:
+            if self.instanced:
+                self.plan_instanced(processor.spinners, "spinner", "Spinners")
+            else:
+                for hitobject in processor.spinners:
+                    self.plan_spinner(hitobject)
+
+        if config.import_approach_circles:
+            relevant_hitobjects = processor.circles + processor.sliders
+            if self.instanced:
+                self.plan_instanced(relevant_hitobjects, "approach_circle", "Approach Circles")
+            else:
+                for hitobject in relevant_hitobjects:
+                    self.plan_approach_circle(hitobject)
+
+        if config.import_cursors:
+            self.specs.append(make_spec("cursor", "Cursor", "Cursor", location=(0, 0, 0)))
+
+        if config.import_sliders and config.import_slider_heads_tails and self.import_type == 'FULL':
+            for hitobject in processor.sliders:
+                self.plan_slider_heads_tails(hitobject)
+
+        return tuple(self.specs)
+
+    def next_index(self):
+        index = self.global_index
+        self.global_index += 1
+        return index
+
+    def plan_instanced(self, hitobjects, object_type, collection):
+        if not hitobjects:
+            return
+        self.specs.append(make_spec(
+            "instanced", INSTANCED_OBJECT_NAMES[object_type], collection,
+            extras={"object_type": object_type, "hitobjects": tuple(hitobjects)}
+        ))
+
+    def plan_circle(self, hitobject):
+        index = self.next_index()
+        config = self.config
+
+        start_frame = int(hitobject.start_frame)
+        end_frame = int(start_frame + 1)
+        early_start_frame = int(start_frame - self.data_manager.preempt_frames)
+
+        frame_values, fixed_values = get_keyframe_values(
+            hitobject, 'circle', self.import_type, start_frame, end_frame, early_start_frame,
+            config.adjusted_ar, config.osu_radius
+        )
+        fixed_values.update(combo_values(hitobject))
+
+        self.specs.append(make_spec(
+            "circle", f"{index:03d}_circle_{hitobject.time}", "Circles",
+            location=map_osu_to_blender(hitobject.x, hitobject.y),
+            hitobject=hitobject,
+            attributes={
+                "show": 'BOOLEAN',
+                "was_hit": 'BOOLEAN',
+                "ar": 'FLOAT',
+                "cs": 'FLOAT',
+                "combo": 'INT',
+                "combo_color_idx": 'INT',
+                "combo_color": 'FLOAT_VECTOR'
+            },
+            frame_values=frame_values,
+            fixed_values=fixed_values,
+            visibility=visibility_track(early_start_frame, end_frame),
+        ))
+
+    def plan_slider(self, hitobject):
+        index = self.next_index()
+        config = self.config
+
+        slider_data = hitobject.slider_data
+        if slider_data is None:
+            print(f"No extras found for slider {hitobject.time}, cannot create slider.")
+            return
+
+        repeat_count = slider_data.repeat_count
+        pixel_length = slider_data.pixel_length
+
+        if config.adaptive_slider_sampling:
+            slider_path = build_slider_path(slider_data.curve_type, slider_data.control_points, pixel_length,
+                                            tolerance=config.slider_tolerance)
+        else:
+            slider_path = build_slider_path(slider_data.curve_type, slider_data.control_points, pixel_length,
+                                            num_points=config.slider_resolution)
+
+        curve_points = map_osu_to_blender_array(slider_path.points[:, 0], slider_path.points[:, 1])
+        self.slider_ends[hitobject] = (tuple(curve_points[0].tolist()), tuple(curve_points[-1].tolist()))
+
+        start_frame = int(hitobject.start_frame)
+        end_frame = int(hitobject.end_frame)
+        early_start_frame = int(start_frame - self.data_manager.preempt_frames)
+        slider_duration_frames = hitobject.duration_frames
+        slider_duration_ms = slider_duration_frames * config.ms_per_frame
+
+        repeat_counter_keyframes = [
+            (early_start_frame, 0),
+            (start_frame, 1)
+        ]
+        if repeat_count != 0:
+            repeat_duration_frames = slider_duration_frames / repeat_count
+            for i in range(1, repeat_count + 1):
+                repeat_end_frame = start_frame + int(i * repeat_duration_frames)
+                repeat_counter_keyframes.append((repeat_end_frame, i + 1))
+
+        frame_values, fixed_values = get_keyframe_values(
+            hitobject, 'slider', self.import_type, start_frame, end_frame, early_start_frame,
+            config.adjusted_ar, config.osu_radius,
+            extra_params={
+                "slider_duration_ms": slider_duration_ms,
+                "slider_duration_frames": slider_duration_frames,
+                "repeat_count": repeat_count,
+                "pixel_length": pixel_length,
+                "repeat_counter_keyframes": repeat_counter_keyframes
+            },
+            ms_per_frame=config.ms_per_frame,
+            audio_lead_in_frames=config.audio_lead_in_frames
+        )
+        fixed_values.update(combo_values(hitobject))
+
+        slider_name = f"{index:03d}_slider_{hitobject.time}_curve"
+        self.specs.append(make_spec(
+            "slider", slider_name, "Sliders",
+            location=(0, 0, 0),
+            hitobject=hitobject,
+            attributes={
+                "show": 'BOOLEAN',
+                "slider_duration_ms": 'FLOAT',
+                "slider_duration_frames": 'FLOAT',
+                "ar": 'FLOAT',
+                "cs": 'FLOAT',
+                "was_hit": 'BOOLEAN',
+                "was_completed": 'BOOLEAN',
+                "repeat_count": 'INT',
+                "pixel_length": 'FLOAT',
+                "combo": 'INT',
+                "combo_color_idx": 'INT',
+                "combo_color": 'FLOAT_VECTOR',
+                "repeat_counter": 'INT',
+            },
+            frame_values=frame_values,
+            fixed_values=fixed_values,
+            visibility=visibility_track(early_start_frame, end_frame),
+            extras={"points": tuple(map(tuple, curve_points.tolist()))},
+        ))
+
+        if config.import_slider_balls:
+            self.plan_slider_ball(hitobject, slider_name, start_frame, end_frame, slider_duration_frames, repeat_count)
+
+        if config.import_slider_ticks:
+            self.plan_slider_ticks(hitobject, slider_name, slider_path, slider_duration_ms, repeat_count)
+
+    def plan_slider_ball(self, hitobject, slider_name, start_frame, end_frame, slider_duration_frames, repeat_count):
+        if repeat_count > 0:
+            repeat_duration_frames = slider_duration_frames / repeat_count
+        else:
+            repeat_duration_frames = slider_duration_frames
+
+        offset_keyframes = []
+        for repeat in range(repeat_count):
+            repeat_start_frame = start_frame + int(repeat * repeat_duration_frames)
+            repeat_end_frame = repeat_start_frame + int(repeat_duration_frames)
+            forward = repeat % 2 == 0
+            offset_keyframes.append((int(repeat_start_frame), 0.0 if forward else 1.0))
+            offset_keyframes.append((int(repeat_end_frame), 1.0 if forward else 0.0))
+
+        self.specs.append(make_spec(
+            "slider_ball", f"{slider_name}_ball", "Slider Balls",
+            location=(0, 0, 0),
+            hitobject=hitobject,
+            attributes={"show": 'BOOLEAN'},
+            frame_values={
+                "show": [
+                    (int(start_frame - 1), False),
+                    (int(start_frame), True),
+                    (int(end_frame), False)
+                ],
+                "offset_factor": offset_keyframes,
+            },
+            visibility=visibility_track(start_frame, end_frame),
+            parent=slider_name,
+            extras={"path_duration": int(repeat_duration_frames)},
+        ))
+
+    def plan_slider_ticks(self, hitobject, slider_name, slider_path, slider_duration_ms, repeat_count):
+        total_ticks = int(slider_duration_ms / SLIDER_TICK_INTERVAL_MS) * repeat_count
+        if total_ticks <= 0:
+            return
+
+        progress = (np.arange(total_ticks) * SLIDER_TICK_INTERVAL_MS) / (slider_duration_ms * repeat_count)
+        osu_positions = slider_path.positions_at_progress(np.clip(progress, 0.0, 1.0))
+        tick_positions = map_osu_to_blender_array(osu_positions[:, 0], osu_positions[:, 1]).tolist()
+
+        for tick, tick_position in enumerate(tick_positions):
+            self.specs.append(make_spec(
+                "slider_tick", f"{slider_name}_tick_{tick}", "Sliders",
+                location=tick_position,
+                hitobject=hitobject,
+                parent=slider_name,
+            ))
+
+    def plan_spinner(self, hitobject):
+        index = self.next_index()
+        config = self.config
+
+        start_frame = int(hitobject.start_frame)
+        end_frame = int(hitobject.end_frame)
+
+        frame_values, fixed_values = get_keyframe_values(
+            hitobject, 'spinner', self.import_type, start_frame, end_frame, start_frame,
+            config.adjusted_ar, osu_radius=0,
+            extra_params={
+                "spinner_duration_ms": hitobject.duration_frames * config.ms_per_frame * config.speed_multiplier,
+                "spinner_duration_frames": hitobject.duration_frames
+            },
+            ms_per_frame=config.ms_per_frame,
+            audio_lead_in_frames=config.audio_lead_in_frames
+        )
+
+        self.specs.append(make_spec(
+            "spinner", f"{index:03d}_spinner_{hitobject.time}", "Spinners",
+            location=map_osu_to_blender(SPINNER_CENTER_X, SPINNER_CENTER_Y),
+            hitobject=hitobject,
+            attributes={
+                "show": 'BOOLEAN',
+                "spinner_duration_ms": 'FLOAT',
+                "spinner_duration_frames": 'FLOAT',
+                "was_hit": 'BOOLEAN',
+                "was_completed": 'BOOLEAN'
+            },
+            frame_values=frame_values,
+            fixed_values=fixed_values,
+            visibility=visibility_track(start_frame, end_frame, hidden_at_end=not hitobject.was_completed),
+        ))
+
+    def plan_approach_circle(self, hitobject):
+        index = self.next_index()
+
+        start_frame = hitobject.start_frame
+        early_start_frame = start_frame - self.data_manager.preempt_frames
+        if self.import_type == 'FULL':
+            start_frame = int(start_frame)
+            early_start_frame = int(early_start_frame)
+
+        self.specs.append(make_spec(
+            "approach_circle", f"{index:03d}_approach_{hitobject.time}", "Approach Circles",
+            location=map_osu_to_blender(hitobject.x, hitobject.y),
+            hitobject=hitobject,
+            attributes={
+                "show": 'BOOLEAN',
+                "scale": 'FLOAT',
+                "cs": 'FLOAT',
+            },
+            frame_values={
+                "show": [
+                    (early_start_frame - 1, False),
+                    (early_start_frame, True),
+                    (start_frame, False),
+                ],
+                "scale": [
+                    (early_start_frame, 4.0),
+                    (start_frame, 1.0),
+                ]
+            },
+            fixed_values={"cs": self.data_manager.osu_radius * SCALE_FACTOR},
+            visibility=visibility_track(early_start_frame, start_frame),
+        ))
+
+    def plan_slider_heads_tails(self, hitobject):
+        if hitobject not in self.slider_ends:
+            return
+
+        start_frame = int(hitobject.start_frame)
+        end_frame = int(hitobject.end_frame)
+        early_start_frame = int(start_frame - self.data_manager.preempt_frames)
+
+        for position in self.slider_ends[hitobject]:
+            index = self.next_index()
+            self.specs.append(make_spec(
+                "slider_head_tail", f"SliderHeadTail_{index:03d}_{hitobject.time}", "Slider Heads Tails",
+                location=position,
+                hitobject=hitobject,
+                visibility=visibility_track(early_start_frame, end_frame),
+            ))
+
+def build_import_plan(data_manager, config):
+    return ImportPlanner(data_manager, config).plan()
+
+def validate_plan(plan):
+    # Spec names key the created objects and the slider parents, so a clash would lose an object
+    duplicates = [name for name, count in Counter(spec.name for spec in plan).items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Import plan contains duplicate object names: {', '.join(duplicates[:10])}")
+    return plan
+
+def summarize_plan(plan):
+    return Counter(spec.kind for spec in plan)
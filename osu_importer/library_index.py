@@ -0,0 +1,206 @@
+# osu_importer/library_index.py
+
+import os
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from osu_importer.parsers.osu_parser import read_osu_metadata
+from osu_importer.parsers.osr_reader import read_osr_header
+
+SCHEMA_VERSION = 1
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
+SEARCH_LIMIT = 100
+
+BEATMAP_COLUMNS = (
+    "path", "songs_dir", "mtime_ns", "size", "md5", "title", "artist", "creator", "version",
+    "audio_file", "approach_rate", "circle_size", "overall_difficulty", "bpm", "object_count",
+)
+
+REPLAY_COLUMNS = (
+    "path", "replays_dir", "mtime_ns", "size", "mode", "beatmap_md5", "username", "mods", "score", "max_combo",
+    "count_300", "count_100", "count_50", "count_miss", "timestamp",
+)
+
+ScanResult = namedtuple("ScanResult", ["total", "updated", "removed", "failed"])
+
+def find_files(directory, extension):
+    stack = [directory]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.lower().endswith(extension):
+                yield entry.path, entry.stat()
+
+def read_beatmap_row(path, stat, songs_dir):
+    try:
+        info = read_osu_metadata(path)
+        if info is None:
+            return None
+        metadata = info["metadata"]
+        difficulty = info["difficulty_settings"]
+        return (
+            path, songs_dir, stat.st_mtime_ns, stat.st_size, info["md5"],
+            metadata.get("Title", ""), metadata.get("Artist", ""), metadata.get("Creator", ""),
+            metadata.get("Version", ""), info["general_settings"].get("AudioFilename", ""),
+            float(difficulty.get("ApproachRate", difficulty.get("OverallDifficulty", 5.0))),
+            float(difficulty.get("CircleSize", 5.0)),
+            float(difficulty.get("OverallDifficulty", 5.0)),
+            info["bpm"],
+            info["total_hitobjects"],
+        )
+    except Exception as e:
+        print(f"Skipping beatmap '{path}' in library scan: {e}")
+        return None
+
+def read_replay_row(path, stat, replays_dir):
+    try:
+        header = read_osr_header(path)
+    except Exception as e:
+        print(f"Skipping replay '{path}' in library scan: {e}")
+        return None
+    return (
+        path, replays_dir, stat.st_mtime_ns, stat.st_size, header.mode, header.beatmap_md5, header.username,
+        header.mods, header.score, header.max_combo, header.count_300, header.count_100, header.count_50,
+        header.count_miss, header.timestamp,
+    )
+
+class LibraryIndex:
+    def __init__(self, database_path):
+        self.database_path = database_path
+        os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self.connection = sqlite3.connect(database_path)
+        self.connection.row_factory = sqlite3.Row
+        self.create_tables()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.connection.close()
+
+    def create_tables(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS beatmaps")
+            self.connection.execute("DROP TABLE IF EXISTS replays")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS beatmaps (
+                path TEXT PRIMARY KEY,
+                songs_dir TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                md5 TEXT NOT NULL,
+                title TEXT,
+                artist TEXT,
+                creator TEXT,
+                version TEXT,
+                audio_file TEXT,
+                approach_rate REAL,
+                circle_size REAL,
+                overall_difficulty REAL,
+                bpm REAL,
+                object_count INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS beatmaps_md5 ON beatmaps (md5);
+            CREATE INDEX IF NOT EXISTS beatmaps_songs_dir ON beatmaps (songs_dir);
+            CREATE TABLE IF NOT EXISTS replays (
+                path TEXT PRIMARY KEY,
+                replays_dir TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mode INTEGER,
+                beatmap_md5 TEXT,
+                username TEXT,
+                mods INTEGER,
+                score INTEGER,
+                max_combo INTEGER,
+                count_300 INTEGER,
+                count_100 INTEGER,
+                count_50 INTEGER,
+                count_miss INTEGER,
+                timestamp REAL
+            );
+            CREATE INDEX IF NOT EXISTS replays_beatmap_md5 ON replays (beatmap_md5);
+            CREATE INDEX IF NOT EXISTS replays_replays_dir ON replays (replays_dir);
+        """)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.commit()
+
+    def scan_songs(self, songs_dir, workers=SCAN_WORKERS):
+        return self.scan_directory("beatmaps", "songs_dir", BEATMAP_COLUMNS, songs_dir, ".osu", read_beatmap_row, workers)
+
+    def scan_replays(self, replays_dir, workers=SCAN_WORKERS):
+        return self.scan_directory("replays", "replays_dir", REPLAY_COLUMNS, replays_dir, ".osr", read_replay_row, workers)
+
+    def scan_directory(self, table, directory_column, columns, directory, extension, read_row, workers):
+        # Only files whose mtime or size changed since the last scan are read again.
+        # Threads rather than processes: MD5 hashing releases the GIL, hit objects are only counted
+        # on the raw bytes, and the Python work left per file is the few short header sections.
+        directory = os.path.abspath(directory)
+        known = {
+            row["path"]: (row["mtime_ns"], row["size"])
+            for row in self.connection.execute(
+                f"SELECT path, mtime_ns, size FROM {table} WHERE {directory_column} = ?", (directory,))
+        }
+
+        files = dict(find_files(directory, extension))
+        changed = [
+            (path, stat) for path, stat in files.items()
+            if known.get(path) != (stat.st_mtime_ns, stat.st_size)
+        ]
+        removed = [path for path in known if path not in files]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(lambda item: read_row(item[0], item[1], directory), changed))
+        valid_rows = [row for row in rows if row is not None]
+
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                valid_rows
+            )
+            self.connection.executemany(f"DELETE FROM {table} WHERE path = ?", [(path,) for path in removed])
+
+        return ScanResult(len(files), len(valid_rows), len(removed), len(rows) - len(valid_rows))
+
+    def search_beatmaps(self, query, limit=SEARCH_LIMIT):
+        # Every word has to appear in the title, artist, creator or difficulty name
+        conditions = []
+        parameters = []
+        for word in query.split():
+            pattern = f"%{word.replace('%', '').replace('_', '')}%"
+            conditions.append("(title LIKE ? OR artist LIKE ? OR creator LIKE ? OR version LIKE ?)")
+            parameters.extend([pattern] * 4)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.connection.execute(
+            f"SELECT * FROM beatmaps {where} ORDER BY artist, title, version LIMIT ?",
+            (*parameters, limit)
+        ).fetchall()
+
+    def find_beatmap_by_md5(self, md5):
+        return self.connection.execute("SELECT * FROM beatmaps WHERE md5 = ? LIMIT 1", (md5,)).fetchone()
+
+    def find_beatmap_for_replay(self, osr_file_path):
+        # Indexed replays are resolved without touching the file, others only have their header read
+        row = self.connection.execute(
+            "SELECT beatmap_md5 FROM replays WHERE path = ?", (os.path.abspath(osr_file_path),)).fetchone()
+        beatmap_md5 = row["beatmap_md5"] if row else read_osr_header(osr_file_path).beatmap_md5
+        return self.find_beatmap_by_md5(beatmap_md5) if beatmap_md5 else None
+
+    def replays_for_beatmap(self, beatmap_md5):
+        return self.connection.execute(
+            "SELECT * FROM replays WHERE beatmap_md5 = ? ORDER BY score DESC", (beatmap_md5,)).fetchall()
+
+    def beatmap_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM beatmaps").fetchone()[0]
@@ -1,22 +1,33 @@
 # osu_importer/objects/base_creator.py
 
 import abc
-from osu_importer.utils.utils import timeit, tag_imported
+from osu_importer.utils.utils import tag_imported
+from osu_importer.utils.profiling import profiler
+from osu_importer.utils.fcurves import TrackBuilder
+
+def keyframe_visibility(obj, visibility):
+    tracks = TrackBuilder(group="Visibility")
+    tracks.step("hide_viewport", visibility)
+    tracks.step("hide_render", visibility)
+    tracks.write(obj)
 
 class BaseHitObjectCreator(abc.ABC):
-    def __init__(self, hitobject, global_index, collection, config, data_manager, import_type):
-        self.hitobject = hitobject
-        self.global_index = global_index
+    def __init__(self, spec, collection, config, parent=None):
+        self.spec = spec
+        self.hitobject = spec.hitobject
         self.collection = collection
         self.config = config
-        self.data_manager = data_manager
-        self.import_type = import_type
+        self.data_manager = config.data_manager
+        self.import_type = config.import_type
+        self.parent = parent
 
     def create(self):
-        with timeit(f"Create {self.__class__.__name__} {self.global_index:03d}_{getattr(self.hitobject, 'time', 'none')}"):
+        with profiler.span(self.__class__.__name__, name=self.spec.name):
             obj = self.create_object()
             if obj is None:
                 return None
+            profiler.count("objects_created")
+            obj.name = self.spec.name
             self.link_object_to_collection(obj)
             self.animate_object(obj)
             return obj
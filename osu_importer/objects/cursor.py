@@ -2,8 +2,14 @@
 
 import bpy
 import math
-from osu_importer.utils.utils import map_osu_to_blender, tag_imported
-from osu_importer.geo_nodes.geometry_nodes import create_geometry_nodes_modifier, set_modifier_inputs_with_keyframes
+import numpy as np
+from osu_importer.utils.utils import map_osu_to_blender_array, tag_imported
+from osu_importer.utils.constants import KEY_FLAGS
+from osu_importer.utils.decimation import decimate_path, state_change_mask
+from osu_importer.utils.templates import get_circle_mesh, get_uv_sphere_mesh, new_template_object
+from osu_importer.utils.fcurves import get_or_create_action, write_vector_fcurves
+from osu_importer.geo_nodes.geometry_nodes import (create_geometry_nodes_modifier, set_modifier_inputs_with_keyframes,
+                                                   set_modifier_inputs_with_fcurves)
 from osu_importer.osu_data_manager import OsuDataManager
 
 
@@ -21,17 +27,11 @@ class CursorCreator:
             cursor_size = self.settings.cursor_size
             if self.import_type == 'FULL':
                 cursor_shape = self.settings.cursor_shape
-                if cursor_shape == 'SPHERE':
-                    bpy.ops.mesh.primitive_uv_sphere_add(radius=cursor_size, location=(0, 0, 0))
-                    cursor = bpy.context.object
-                elif cursor_shape == 'CIRCLE':
-                    bpy.ops.mesh.primitive_circle_add(vertices=32, radius=cursor_size, fill_type='NGON',
-                                                      location=(0, 0, 0),
-                                                      rotation=(math.radians(90), 0, 0))
-                    cursor = bpy.context.object
+                if cursor_shape == 'CIRCLE':
+                    cursor = new_template_object("Cursor", get_circle_mesh(cursor_size, 32),
+                                                 rotation=(math.radians(90), 0, 0))
                 else:
-                    bpy.ops.mesh.primitive_uv_sphere_add(radius=cursor_size, location=(0, 0, 0))
-                    cursor = bpy.context.object
+                    cursor = new_template_object("Cursor", get_uv_sphere_mesh(cursor_size))
             else:
                 mesh = bpy.data.meshes.new("Cursor")
                 mesh.vertices.add(1)
@@ -82,54 +82,57 @@ class CursorCreator:
             print("Cursor object is None, skipping animation.")
             return
 
-        replay_data = self.data_manager.replay_data
-        key_presses = self.data_manager.key_presses
+        osr_parser = self.data_manager.osr_parser
         speed_multiplier = self.data_manager.speed_multiplier
         ms_per_frame = self.data_manager.ms_per_frame
         audio_lead_in_frames = self.data_manager.audio_lead_in_frames
-        total_time = 0
 
         try:
-            for i, event in enumerate(replay_data):
-                total_time += event.time_delta
-                if event.x == -256 and event.y == -256:
-                    continue
-
-                corrected_x, corrected_y, corrected_z = map_osu_to_blender(event.x, event.y)
-                location = (corrected_x, corrected_y, corrected_z)
-
-                adjusted_time_ms = total_time / speed_multiplier
-                frame = (adjusted_time_ms / ms_per_frame) + audio_lead_in_frames
-
-                if self.import_type == 'BASE':
-                    set_cursor_keyframes(
-                        self.cursor,
-                        frame,
-                        location,
-                        key_presses[i]
-                    )
-                else:
-                    self.cursor.location = location
-                    self.cursor.keyframe_insert(data_path='location', frame=frame)
+            window = slice(None)
+            if self.settings.time_window:
+                window = slice(*self.data_manager.replay_window_indices(*self.settings.time_window))
+            times, xs, ys = osr_parser.times[window], osr_parser.xs[window], osr_parser.ys[window]
+
+            valid = ~((xs == -256) & (ys == -256))
+            if not valid.any():
+                print("No replay events found, skipping cursor animation.")
+                return
+
+            keys = osr_parser.keys[window][valid]
+            adjusted_time_ms = times[valid] / speed_multiplier
+            xs, ys = xs[valid], ys[valid]
+
+            kept = decimate_path(adjusted_time_ms, xs, ys, self.settings.cursor_max_error,
+                                 keep=state_change_mask(keys))
+            print(f"Cursor decimation kept {len(kept)} of {len(adjusted_time_ms)} replay events.")
+            adjusted_time_ms, xs, ys, keys = adjusted_time_ms[kept], xs[kept], ys[kept], keys[kept]
+
+            frames = (adjusted_time_ms / ms_per_frame) + audio_lead_in_frames
+            locations = map_osu_to_blender_array(xs, ys)
+
+            key_states = None
+            if self.import_type == 'BASE':
+                key_states = {name: (keys & flag) != 0 for name, flag in KEY_FLAGS.items()}
+
+            set_cursor_keyframes(self.cursor, frames, locations, key_states)
 
             print(f"Cursor '{self.cursor.name}' animated successfully.")
         except Exception as e:
             print(f"Error animating cursor: {e}")
 
 
-def set_cursor_keyframes(cursor, frame, location, key_presses):
-    cursor.location = location
-    cursor.keyframe_insert(data_path='location', frame=frame)
+def set_cursor_keyframes(cursor, frames, locations, key_states=None):
+    frames = np.asarray(frames, dtype=np.float64)
+    action = get_or_create_action(cursor)
+    write_vector_fcurves(action, "location", frames, locations, group="Object Transforms")
+
+    if key_states is None:
+        return
 
-    frame_values = {
-        "k1": [(int(frame), bool(key_presses['k1']))],
-        "k2": [(int(frame), bool(key_presses['k2']))],
-        "m1": [(int(frame), bool(key_presses['m1']))],
-        "m2": [(int(frame), bool(key_presses['m2']))]
-    }
-    set_modifier_inputs_with_keyframes(cursor, {
+    key_frames = np.trunc(frames)
+    set_modifier_inputs_with_fcurves(cursor, {
         "k1": 'BOOLEAN',
         "k2": 'BOOLEAN',
         "m1": 'BOOLEAN',
         "m2": 'BOOLEAN'
-    }, frame_values, fixed_values=None)
+    }, {key: (key_frames, states) for key, states in key_states.items()})
@@ -0,0 +1,129 @@
+# osu_importer/objects/instanced.py
+
+import bpy
+import numpy as np
+from osu_importer.utils.utils import map_osu_to_blender, tag_imported
+from osu_importer.utils.profiling import profiler
+from osu_importer.import_plan import INSTANCED_OBJECT_NAMES
+from osu_importer.utils.constants import SCALE_FACTOR, SPINNER_CENTER_X, SPINNER_CENTER_Y
+from osu_importer.geo_nodes.geometry_nodes import (create_instanced_hit_objects_tree, add_geometry_nodes_modifier,
+                                                   INSTANCED_NODE_GROUP_NAME)
+
+ATTRIBUTE_DTYPES = {
+    'FLOAT': np.float32,
+    'INT': np.int32,
+    'BOOLEAN': bool,
+    'FLOAT_VECTOR': np.float32,
+}
+
+class InstancedHitObjectsCreator:
+    OBJECT_NAMES = INSTANCED_OBJECT_NAMES
+
+    def __init__(self, hitobjects, object_type, collection, config, data_manager):
+        self.hitobjects = hitobjects
+        self.object_type = object_type
+        self.collection = collection
+        self.config = config
+        self.data_manager = data_manager
+
+    def create(self):
+        if not self.hitobjects:
+            return None
+
+        name = self.OBJECT_NAMES[self.object_type]
+        with profiler.span(f"Create {name}", points=len(self.hitobjects)):
+            profiler.count("instanced_points", len(self.hitobjects))
+            positions, attributes = self.collect_point_data()
+
+            mesh = bpy.data.meshes.new(f"{name}_mesh")
+            mesh.vertices.add(len(positions))
+            mesh.vertices.foreach_set("co", np.asarray(positions, dtype=np.float32).ravel())
+
+            for attr_name, (data_type, values) in attributes.items():
+                attribute = mesh.attributes.new(attr_name, data_type, 'POINT')
+                values = np.asarray(values, dtype=ATTRIBUTE_DTYPES[data_type]).ravel()
+                attribute.data.foreach_set("vector" if data_type == 'FLOAT_VECTOR' else "value", values)
+            mesh.update()
+
+            obj = bpy.data.objects.new(name, mesh)
+
+            create_instanced_hit_objects_tree()
+            modifier = add_geometry_nodes_modifier(obj, INSTANCED_NODE_GROUP_NAME)
+            tag_imported(modifier)
+
+            self.collection.objects.link(obj)
+            if obj.users_collection:
+                for col in obj.users_collection:
+                    if col != self.collection:
+                        col.objects.unlink(obj)
+            tag_imported(obj)
+
+            print(f"Instanced object '{obj.name}' created with {len(positions)} points.")
+            return obj
+
+    def collect_point_data(self):
+        preempt_frames = self.data_manager.preempt_frames
+        osu_radius = self.config.osu_radius
+
+        positions = []
+        early_start_frames = []
+        start_frames = []
+        end_frames = []
+        judged_hit = []
+        judged_completed = []
+
+        for hitobject in self.hitobjects:
+            if self.object_type == 'spinner':
+                positions.append(map_osu_to_blender(SPINNER_CENTER_X, SPINNER_CENTER_Y))
+                start_frame = int(hitobject.start_frame)
+                early_start_frame = start_frame
+                end_frame = int(hitobject.end_frame)
+            elif self.object_type == 'circle':
+                positions.append(map_osu_to_blender(hitobject.x, hitobject.y))
+                start_frame = int(hitobject.start_frame)
+                early_start_frame = int(start_frame - preempt_frames)
+                end_frame = start_frame
+            else:
+                positions.append(map_osu_to_blender(hitobject.x, hitobject.y))
+                start_frame = hitobject.start_frame
+                early_start_frame = start_frame - preempt_frames
+                end_frame = start_frame
+
+            early_start_frames.append(early_start_frame)
+            start_frames.append(start_frame)
+            end_frames.append(end_frame)
+            judged_hit.append(hitobject.was_hit)
+            judged_completed.append(hitobject.was_completed)
+
+        count = len(positions)
+        attributes = {
+            "early_start_frame": ('FLOAT', early_start_frames),
+            "start_frame": ('FLOAT', start_frames),
+            "end_frame": ('FLOAT', end_frames),
+            # circles stay visible after their hit, GN_Osu handles the fade out
+            "hide_at_end": ('BOOLEAN', [self.object_type != 'circle'] * count),
+            "judged_hit": ('BOOLEAN', judged_hit),
+            "judged_completed": ('BOOLEAN', judged_completed),
+        }
+
+        if self.object_type == 'circle':
+            attributes.update({
+                "ar": ('FLOAT', [self.config.adjusted_ar] * count),
+                "cs": ('FLOAT', [osu_radius * SCALE_FACTOR * 2] * count),
+                "combo": ('INT', [hitobject.combo_number for hitobject in self.hitobjects]),
+                "combo_color_idx": ('INT', [hitobject.combo_color_idx for hitobject in self.hitobjects]),
+                "combo_color": ('FLOAT_VECTOR', [hitobject.combo_color for hitobject in self.hitobjects]),
+            })
+        elif self.object_type == 'spinner':
+            ms_per_frame = self.config.ms_per_frame
+            speed_multiplier = self.config.speed_multiplier
+            attributes.update({
+                "spinner_duration_ms": ('FLOAT', [
+                    hitobject.duration_frames * ms_per_frame * speed_multiplier for hitobject in self.hitobjects
+                ]),
+                "spinner_duration_frames": ('FLOAT', [hitobject.duration_frames for hitobject in self.hitobjects]),
+            })
+        else:
+            attributes["cs"] = ('FLOAT', [osu_radius * SCALE_FACTOR] * count)
+
+        return positions, attributes
@@ -1,75 +1,18 @@
 # osu_importer/objects/slider_head_tail.py
 
-import bpy
 import math
-from osu_importer.utils.utils import timeit, get_keyframe_values, tag_imported
+from osu_importer.objects.base_creator import BaseHitObjectCreator, keyframe_visibility
 from osu_importer.utils.constants import SCALE_FACTOR
-from osu_importer.geo_nodes.geometry_nodes import create_geometry_nodes_modifier, set_modifier_inputs_with_keyframes
+from osu_importer.utils.templates import get_circle_mesh, new_template_object
 
-class SliderHeadTailCreator:
-    def __init__(self, hitobject, position, global_index, slider_heads_tails_collection, config, data_manager, import_type):
-        self.hitobject = hitobject
-        self.position = position
-        self.global_index = global_index
-        self.slider_heads_tails_collection = slider_heads_tails_collection
-        self.config = config
-        self.data_manager = data_manager
-        self.import_type = import_type
-        self.create_slider_head_tail()
+class SliderHeadTailCreator(BaseHitObjectCreator):
+    def create_object(self):
+        if self.import_type != 'FULL':
+            print(f"Unsupported import type '{self.import_type}' for SliderHeadTail.")
+            return None
 
-    def create_slider_head_tail(self):
-        hitobject = self.hitobject
+        return new_template_object(self.spec.name, get_circle_mesh(self.data_manager.osu_radius * SCALE_FACTOR * 2),
+                                   location=self.spec.location, rotation=(math.radians(90), 0, 0))
 
-        if not hasattr(hitobject, 'start_frame') or not hasattr(hitobject, 'end_frame'):
-            print(f"HitObject {hitobject} hat keine Attribute 'start_frame' oder 'end_frame'.")
-            return
-
-        with timeit(f"Create SliderHeadTail {self.global_index:03d}_head_tail_{hitobject.time}"):
-            data_manager = self.data_manager
-
-            osu_radius = data_manager.osu_radius
-            preempt_frames = data_manager.preempt_frames
-
-            start_frame = int(hitobject.start_frame)
-            end_frame = int(hitobject.end_frame)
-            early_start_frame = int(start_frame - preempt_frames)
-
-            corrected_x, corrected_y, corrected_z = self.position.x, self.position.y, self.position.z
-
-            if self.import_type == 'FULL':
-                bpy.ops.mesh.primitive_circle_add(
-                    fill_type='NGON',
-                    radius=osu_radius * SCALE_FACTOR * 2,
-                    location=(corrected_x, corrected_y, corrected_z),
-                    rotation=(math.radians(90), 0, 0)
-                )
-                head_tail_obj = bpy.context.object
-
-                head_tail_obj.name = f"SliderHeadTail_{self.global_index:03d}_{hitobject.time}"
-
-                tag_imported(head_tail_obj)
-
-                head_tail_obj.hide_viewport = True
-                head_tail_obj.hide_render = True
-                head_tail_obj.keyframe_insert(data_path="hide_viewport", frame=int(early_start_frame - 1))
-                head_tail_obj.keyframe_insert(data_path="hide_render", frame=int(early_start_frame - 1))
-
-                head_tail_obj.hide_viewport = False
-                head_tail_obj.hide_render = False
-                head_tail_obj.keyframe_insert(data_path="hide_viewport", frame=int(early_start_frame))
-                head_tail_obj.keyframe_insert(data_path="hide_render", frame=int(early_start_frame))
-
-                head_tail_obj.hide_viewport = True
-                head_tail_obj.hide_render = True
-                head_tail_obj.keyframe_insert(data_path="hide_viewport", frame=int(end_frame))
-                head_tail_obj.keyframe_insert(data_path="hide_render", frame=int(end_frame))
-
-                self.slider_heads_tails_collection.objects.link(head_tail_obj)
-                if head_tail_obj.users_collection:
-                    for col in head_tail_obj.users_collection:
-                        if col != self.slider_heads_tails_collection:
-                            col.objects.unlink(head_tail_obj)
-
-            else:
-                print(f"Unsupported import type '{self.import_type}' for SliderHeadTail.")
-                return
+    def animate_object(self, head_tail_obj):
+        keyframe_visibility(head_tail_obj, self.spec.visibility)
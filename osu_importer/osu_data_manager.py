@@ -2,12 +2,14 @@
 
 import bpy
 import os
-import bisect
+import numpy as np
 from osu_importer.parsers.osu_parser import OsuParser, OsrParser
 from osu_importer.utils.constants import *
 from osu_importer.utils.mod_functions import calculate_speed_multiplier
-from osu_importer.utils.utils import tag_imported
+from osu_importer.utils.utils import tag_imported, get_beatmap_cache_dir
 from osu_importer.parsers.hitobjects import HitObjectsProcessor
+from osu_importer.parsers.timing_points import TimingPointIndex
+from osu_importer.utils.hit_judgement import judge_hits
 
 def calculate_override_mods(props):
     mods = 0
@@ -43,7 +45,8 @@ def calculate_override_mods(props):
 
 class OsuDataManager:
     def __init__(self, osu_file_path, osr_file_path, props):
-        self.osu_parser = OsuParser(osu_file_path)
+        cache_dir = get_beatmap_cache_dir() if props.persistent_beatmap_cache else None
+        self.osu_parser = OsuParser(osu_file_path, cache_dir=cache_dir)
         self.osr_parser = OsrParser(osr_file_path)
         self.hitobjects_processor = HitObjectsProcessor(self)
         self.props = props
@@ -63,6 +66,8 @@ class OsuDataManager:
         self.base_ar = float(self.osu_parser.difficulty_settings.get("ApproachRate", 5.0))
         self.base_cs = float(self.osu_parser.difficulty_settings.get("CircleSize", 5.0))
         self.base_od = float(self.osu_parser.difficulty_settings.get("OverallDifficulty", 5.0))
+        self.slider_multiplier = float(self.osu_parser.difficulty_settings.get("SliderMultiplier", 1.4))
+        self.timing_point_index = TimingPointIndex(self.osu_parser.timing_points)
 
         self.calculate_adjusted_values()
         self.calculate_hit_objects_frames()
@@ -162,6 +167,20 @@ class OsuDataManager:
                 hitobject.end_frame = hitobject.start_frame
                 hitobject.slider_end_time = hitobject_time
 
+    def apply_time_window(self, first_frame, last_frame):
+        total = len(self.hitobjects)
+        self.hitobjects_processor.restrict_to_frame_window(first_frame, last_frame, self.preempt_frames)
+        print(f"Time window frames {first_frame}-{last_frame}: {len(self.hitobjects)} of {total} hit objects kept.")
+
+    def replay_window_indices(self, first_frame, last_frame):
+        # Converts scene frames back to replay time and bisects the cumulative frame times
+        times = self.osr_parser.times
+        first_time = (first_frame - self.audio_lead_in_frames) * self.ms_per_frame * self.speed_multiplier
+        last_time = (last_frame - self.audio_lead_in_frames) * self.ms_per_frame * self.speed_multiplier
+        lo = max(int(np.searchsorted(times, first_time, side='left')) - 1, 0)
+        hi = min(int(np.searchsorted(times, last_time, side='right')) + 1, len(times))
+        return lo, hi
+
     def import_audio(self):
         audio_filename = self.beatmap_info['general_settings'].get("AudioFilename")
         if not audio_filename:
@@ -209,94 +228,33 @@ class OsuDataManager:
         speed_multiplier = self.speed_multiplier
         audio_lead_in = self.audio_lead_in
 
-        key_press_times = [
-            (kp['time'] / speed_multiplier) + audio_lead_in for kp in self.key_presses
-        ]
-
-        if not key_press_times:
+        if len(self.osr_parser.times) == 0:
             print("No key presses found.")
             return
 
-        key_press_times, key_presses = zip(*sorted(zip(key_press_times, self.key_presses), key=lambda x: x[0]))
-
-        for hitobject in self.hitobjects:
-            hitobject_time = (hitobject.time / speed_multiplier) + audio_lead_in
-
-            window_start = hitobject_time - hit_window
-            window_end = hitobject_time + hit_window
-
-            start_idx = bisect.bisect_left(key_press_times, window_start)
-            end_idx = bisect.bisect_right(key_press_times, window_end)
-
-            was_hit = False
-
-            if hitobject.hit_type & 1:  # Circle
-                for idx in range(start_idx, end_idx):
-                    if any(key_presses[idx][k] for k in ('k1', 'k2', 'm1', 'm2')):
-                        was_hit = True
-                        break
-                hitobject.was_hit = was_hit
-
-            elif hitobject.hit_type & 2:  # Slider
-                slider_end_time = hitobject.slider_end_time
-                window_end = slider_end_time + hit_window
-                end_idx = bisect.bisect_right(key_press_times, window_end)
-                was_hit = False
-                for idx in range(start_idx, end_idx):
-                    if any(key_presses[idx][k] for k in ('k1', 'k2', 'm1', 'm2')):
-                        was_hit = True
-                        break
-                hitobject.was_hit = was_hit
-                hitobject.was_completed = False
+        store = self.hitobjects_processor.store
+        was_hit, was_completed, hit_offsets = judge_hits(
+            object_times=store.data["time"] / speed_multiplier + audio_lead_in,
+            end_times=store.data["slider_end_time"] + audio_lead_in,
+            hit_types=store.data["hit_type"],
+            key_times=(self.osr_parser.times / speed_multiplier) + audio_lead_in,
+            keys=self.osr_parser.keys,
+            hit_window=hit_window
+        )
 
-            elif hitobject.hit_type & 8:  # Spinner
-                spinner_end_time = hitobject.slider_end_time
-                window_end = spinner_end_time + hit_window
-
-                end_idx = bisect.bisect_right(key_press_times, window_end)
-
-                for idx in range(start_idx, end_idx):
-                    if any(key_presses[idx][k] for k in ('k1', 'k2', 'm1', 'm2')):
-                        was_hit = True
-                        break
-                hitobject.was_hit = was_hit
-
-                if was_hit:
-                    end_press_idx = bisect.bisect_left(key_press_times, spinner_end_time)
-                    was_completed = False
-                    if end_press_idx < len(key_press_times):
-                        if any(key_presses[end_press_idx - 1][k] for k in ('k1', 'k2', 'm1', 'm2')):
-                            was_completed = True
-                    hitobject.was_completed = was_completed
-                else:
-                    hitobject.was_completed = False
+        store.data["was_hit"] = was_hit
+        store.data["was_completed"] = was_completed
+        store.data["hit_offset"] = hit_offsets
 
     def calculate_slider_duration(self, hitobject):
-        start_time_ms = hitobject.time
-        repeat_count = int(hitobject.extras[1]) if len(hitobject.extras) > 1 else 1
-        pixel_length = float(hitobject.extras[2]) if len(hitobject.extras) > 2 else 100.0
-        speed_multiplier = calculate_speed_multiplier(self.mods)
-        slider_multiplier = float(self.osu_parser.difficulty_settings.get("SliderMultiplier", 1.4))
-        timing_points = self.osu_parser.timing_points
-
-        beat_duration = 500
-        inherited_multiplier = 1.0
-        current_beat_length = None
-
-        for offset, beat_length in timing_points:
-            if start_time_ms >= offset:
-                if beat_length < 0:
-                    inherited_multiplier = -100 / beat_length
-                else:
-                    current_beat_length = beat_length
-            else:
-                break
-
-        if current_beat_length is not None and current_beat_length > 0:
-            beat_duration = current_beat_length
-
-        slider_duration_ms = (pixel_length / (slider_multiplier * 100)) * beat_duration * repeat_count
-        slider_duration_ms /= (speed_multiplier * inherited_multiplier)
+        slider_data = hitobject.slider_data
+        repeat_count = slider_data.repeat_count if slider_data else 1
+        pixel_length = slider_data.pixel_length if slider_data else 100.0
+
+        beat_duration, inherited_multiplier = self.timing_point_index.lookup(hitobject.time)
+
+        slider_duration_ms = (pixel_length / (self.slider_multiplier * 100)) * beat_duration * repeat_count
+        slider_duration_ms /= (self.speed_multiplier * inherited_multiplier)
 
         return slider_duration_ms
 
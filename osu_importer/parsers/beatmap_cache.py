@@ -0,0 +1,149 @@
+# osu_importer/parsers/beatmap_cache.py
+
+import os
+import gzip
+import pickle
+import hashlib
+from collections import OrderedDict
+
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_EXTENSION = ".osucache"
+MAX_CACHE_ENTRIES = 16
+
+def copy_state(state):
+    # Values inside the containers are immutable tuples and strings, so fresh containers are enough
+    return {
+        field: list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+        for field, value in state.items()
+    }
+
+def file_md5(path):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+class BeatmapCache:
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.fingerprints = {}
+
+    def fingerprint(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.fingerprints.get(path)
+        if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            return known[2]
+        content_hash = file_md5(path)
+        self.fingerprints[path] = (stat.st_size, stat.st_mtime_ns, content_hash)
+        return content_hash
+
+    def key(self, path):
+        path = os.path.abspath(path)
+        content_hash = self.fingerprint(path)
+        size, mtime_ns, _ = self.fingerprints[path]
+        return path, size, mtime_ns, content_hash
+
+    def get(self, path, cache_dir=None):
+        try:
+            key = self.key(path)
+        except OSError:
+            return None
+
+        state = self.entries.get(key)
+        if state is not None:
+            self.entries.move_to_end(key)
+            if cache_dir:
+                self.touch(key[3], cache_dir)
+            return copy_state(state)
+
+        if cache_dir:
+            state = self.load_from_disk(key[3], cache_dir)
+            if state is not None:
+                self.store(key, state)
+                return copy_state(state)
+        return None
+
+    def put(self, path, state, cache_dir=None):
+        try:
+            key = self.key(path)
+        except OSError:
+            return
+
+        self.store(key, copy_state(state))
+        if cache_dir:
+            self.save_to_disk(key[3], state, cache_dir)
+            self.prune_disk(cache_dir)
+
+    def store(self, key, state):
+        # A changed file gets a new key, so older entries for the same path are stale
+        for stale_key in [k for k in self.entries if k[0] == key[0] and k != key]:
+            del self.entries[stale_key]
+
+        self.entries[key] = state
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            evicted_key, _ = self.entries.popitem(last=False)
+            if not any(k[0] == evicted_key[0] for k in self.entries):
+                self.fingerprints.pop(evicted_key[0], None)
+
+    def clear(self, cache_dir=None):
+        self.entries.clear()
+        self.fingerprints.clear()
+        if cache_dir and os.path.isdir(cache_dir):
+            for filename in os.listdir(cache_dir):
+                if filename.endswith(CACHE_FILE_EXTENSION):
+                    os.remove(os.path.join(cache_dir, filename))
+
+    def cache_file_path(self, content_hash, cache_dir):
+        return os.path.join(cache_dir, content_hash + CACHE_FILE_EXTENSION)
+
+    def load_from_disk(self, content_hash, cache_dir):
+        cache_file = self.cache_file_path(content_hash, cache_dir)
+        if not os.path.isfile(cache_file):
+            return None
+        try:
+            with gzip.open(cache_file, 'rb') as file:
+                version, state = pickle.load(file)
+        except Exception as e:
+            print(f"Ignoring unreadable beatmap cache file '{cache_file}': {e}")
+            return None
+        if version != CACHE_FORMAT_VERSION:
+            return None
+        self.touch(content_hash, cache_dir)
+        return state
+
+    def touch(self, content_hash, cache_dir):
+        # The modification time marks the last use for pruning
+        try:
+            os.utime(self.cache_file_path(content_hash, cache_dir))
+        except OSError:
+            pass
+
+    def save_to_disk(self, content_hash, state, cache_dir):
+        cache_file = self.cache_file_path(content_hash, cache_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_file = cache_file + ".tmp"
+            with gzip.open(temp_file, 'wb', compresslevel=6) as file:
+                pickle.dump((CACHE_FORMAT_VERSION, state), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            print(f"Could not write beatmap cache file '{cache_file}': {e}")
+
+    def prune_disk(self, cache_dir):
+        # Same LRU bound as in memory, the least recently used files are removed first
+        try:
+            cache_files = [
+                entry for entry in os.scandir(cache_dir)
+                if entry.name.endswith(CACHE_FILE_EXTENSION)
+            ]
+            cache_files.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+            for entry in cache_files[self.max_entries:]:
+                os.remove(entry.path)
+        except OSError as e:
+            print(f"Could not prune beatmap cache directory '{cache_dir}': {e}")
+
+beatmap_cache = BeatmapCache()
@@ -1,76 +1,209 @@
 # osu_importer/parsers/hitobjects.py
 
+import math
+import numpy as np
+from collections import namedtuple
+
+COMBO_COLORS = [
+    (0.0, 0.0, 1.0),    # Blue
+    (1.0, 0.0, 0.0),    # Red
+    (0.0, 1.0, 0.0),    # Green
+    (1.0, 1.0, 0.0),    # Yellow
+    (0.5, 0.0, 0.5),    # Purple
+    (1.0, 0.65, 0.0),   # Orange
+    (1.0, 0.0, 1.0),    # Pink
+    (0.6, 0.4, 0.2),    # Brown
+    (0.5, 0.5, 0.5),    # Grey
+    (0.0, 1.0, 1.0),    # Cyan
+]
+
+NEW_COMBO_FLAG = 4
+SLIDER_FLAG = 2
+
+SliderData = namedtuple("SliderData", [
+    "curve_type", "control_points", "repeat_count", "pixel_length", "edge_sounds", "edge_sets",
+])
+
+def parse_slider_data(x, y, extras):
+    if not extras:
+        return None
+
+    curve_parts = extras[0].split('|')
+    control_points = [(x, y)]
+    for cp in curve_parts[1:]:
+        cp_x, cp_y = cp.split(':')
+        control_points.append((float(cp_x), float(cp_y)))
+
+    repeat_count = int(extras[1]) if len(extras) > 1 else 1
+    pixel_length = float(extras[2]) if len(extras) > 2 else 100.0
+    edge_sounds = tuple(int(sound) for sound in extras[3].split('|')) if len(extras) > 3 and extras[3] else ()
+    edge_sets = tuple(
+        tuple(int(value) for value in edge_set.split(':'))
+        for edge_set in extras[4].split('|')
+    ) if len(extras) > 4 and extras[4] else ()
+
+    points = np.array(control_points, dtype=np.float64)
+    points.setflags(write=False)
+    return SliderData(curve_parts[0], points, repeat_count, pixel_length, edge_sounds, edge_sets)
+
+HITOBJECT_DTYPE = np.dtype([
+    ("x", np.int32),
+    ("y", np.int32),
+    ("time", np.int32),
+    ("hit_type", np.uint8),
+    ("hit_sound", np.uint8),
+    ("start_frame", np.int32),
+    ("end_frame", np.int32),
+    ("duration_frames", np.int32),
+    ("slider_end_time", np.float64),
+    ("was_hit", np.bool_),
+    ("was_completed", np.bool_),
+    ("hit_offset", np.float64),
+    ("combo_number", np.int32),
+    ("combo_color_idx", np.int16),
+    ("is_new_combo", np.bool_),
+])
+
+class HitObjectStore:
+    def __init__(self, tokens):
+        # Tokens are consumed in a single pass, so a parser can stream them from the file
+        columns = []
+        self.extras = []
+        self.slider_data = {}
+        for index, token in enumerate(tokens):
+            columns.append(token[:5])
+            self.extras.append(list(token[5]))
+            if token[3] & SLIDER_FLAG and not token[3] & 1:
+                self.slider_data[index] = parse_slider_data(token[0], token[1], token[5])
+
+        self.data = np.zeros(len(columns), dtype=HITOBJECT_DTYPE)
+        if columns:
+            columns = np.array(columns, dtype=np.int64)
+            for column, field in enumerate(("x", "y", "time", "hit_type", "hit_sound")):
+                self.data[field] = columns[:, column]
+        self.data["hit_offset"] = np.nan
+
+        self.views = [HitObject(self, index) for index in range(len(self.data))]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def frame_window_indices(self, first_frame, last_frame, preempt_frames):
+        # Hit objects are stored in time order, so start frames can be bisected
+        start_frames = self.data["start_frame"]
+        end_frames = self.data["end_frame"]
+        if len(start_frames) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        longest_duration = int((end_frames - start_frames).max())
+        lo = np.searchsorted(start_frames, first_frame - longest_duration, side='left')
+        hi = np.searchsorted(start_frames, last_frame + preempt_frames, side='right')
+        candidates = np.arange(lo, hi)
+        return candidates[end_frames[lo:hi] >= first_frame]
+
+    def assign_combos(self, combo_color_count):
+        is_new_combo = (self.data["hit_type"] & NEW_COMBO_FLAG) != 0
+        combo_groups = np.cumsum(is_new_combo)
+        indices = np.arange(len(self.data))
+        group_starts = np.maximum.accumulate(np.where(is_new_combo, indices, 0))
+
+        self.data["is_new_combo"] = is_new_combo
+        self.data["combo_number"] = indices - group_starts + 1
+        self.data["combo_color_idx"] = combo_groups % combo_color_count
+
+def field_property(name, cast):
+    def getter(self):
+        return cast(self.store.data[name][self.index])
+
+    def setter(self, value):
+        self.store.data[name][self.index] = value
+
+    return property(getter, setter)
+
+def optional_float(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
 class HitObject:
-    def __init__(self, x, y, time, hit_type, hit_sound, extras):
-        self.x = x
-        self.y = y
-        self.time = time
-        self.hit_type = hit_type
-        self.hit_sound = hit_sound
-        self.extras = extras
-        self.frame = None
-        self.start_frame = None
-        self.end_frame = None
-        self.duration_frames = None
-        self.was_hit = False
-        self.was_completed = False
-        self.combo_number = 0
-        self.is_new_combo = False
-        self.combo_color = None
-        self.combo_color_idx = None
+    __slots__ = ("store", "index")
+
+    x = field_property("x", int)
+    y = field_property("y", int)
+    time = field_property("time", int)
+    hit_type = field_property("hit_type", int)
+    hit_sound = field_property("hit_sound", int)
+    start_frame = field_property("start_frame", int)
+    end_frame = field_property("end_frame", int)
+    duration_frames = field_property("duration_frames", int)
+    slider_end_time = field_property("slider_end_time", float)
+    was_hit = field_property("was_hit", bool)
+    was_completed = field_property("was_completed", bool)
+    combo_number = field_property("combo_number", int)
+    combo_color_idx = field_property("combo_color_idx", int)
+    is_new_combo = field_property("is_new_combo", bool)
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def extras(self):
+        return self.store.extras[self.index]
+
+    @property
+    def slider_data(self):
+        return self.store.slider_data.get(self.index)
+
+    @property
+    def hit_offset(self):
+        return optional_float(self.store.data["hit_offset"][self.index])
+
+    @hit_offset.setter
+    def hit_offset(self, value):
+        self.store.data["hit_offset"][self.index] = np.nan if value is None else value
+
+    @property
+    def combo_color(self):
+        return COMBO_COLORS[self.combo_color_idx]
+
+    def __repr__(self):
+        return f"HitObject(time={self.time}, x={self.x}, y={self.y}, hit_type={self.hit_type})"
 
 class HitObjectsProcessor:
-    COMBO_COLORS = [
-        (0.0, 0.0, 1.0),    # Blue
-        (1.0, 0.0, 0.0),    # Red
-        (0.0, 1.0, 0.0),    # Green
-        (1.0, 1.0, 0.0),    # Yellow
-        (0.5, 0.0, 0.5),    # Purple
-        (1.0, 0.65, 0.0),   # Orange
-        (1.0, 0.0, 1.0),    # Pink
-        (0.6, 0.4, 0.2),    # Brown
-        (0.5, 0.5, 0.5),    # Grey
-        (0.0, 1.0, 1.0),    # Cyan
-    ]
+    COMBO_COLORS = COMBO_COLORS
+
     def __init__(self, data_manager):
         self.data_manager = data_manager
+        self.store = None
         self.circles = []
         self.sliders = []
         self.spinners = []
         self.process_hitobjects()
 
     def process_hitobjects(self):
-        hitobjects = self.data_manager.osu_parser.hitobjects
-        current_combo = 0
-        combo_color_index = 0
-
-        for line in hitobjects:
-            parts = line.split(',')
-            if len(parts) < 5:
-                continue
-            x, y, time = int(parts[0]), int(parts[1]), int(parts[2])
-            hit_type, hit_sound = int(parts[3]), int(parts[4])
-            extras = parts[5:]
-
-            hit_object = HitObject(x, y, time, hit_type, hit_sound, extras)
-
-            NEW_COMBO_FLAG = 4
-            is_new_combo = hit_type & NEW_COMBO_FLAG
-            hit_object.is_new_combo = bool(is_new_combo)
-
-            if is_new_combo:
-                current_combo = 1
-                combo_color_index = (combo_color_index + 1) % len(self.COMBO_COLORS)
-            else:
-                current_combo += 1
-
-            hit_object.combo_number = current_combo
-            hit_object.combo_color = self.COMBO_COLORS[combo_color_index]
-            hit_object.combo_color_idx = combo_color_index
+        self.store = HitObjectStore(self.data_manager.osu_parser.iter_hitobject_tokens())
+        self.store.assign_combos(len(self.COMBO_COLORS))
+        self.classify(self.store)
+
+    def restrict_to_frame_window(self, first_frame, last_frame, preempt_frames):
+        indices = self.store.frame_window_indices(first_frame, last_frame, preempt_frames)
+        self.circles = []
+        self.sliders = []
+        self.spinners = []
+        self.classify(self.store[index] for index in indices.tolist())
 
+    def classify(self, hitobjects):
+        for hit_object in hitobjects:
+            hit_type = hit_object.hit_type
             if hit_type & 1:  # Circle
                 self.circles.append(hit_object)
             elif hit_type & 2:  # Slider
                 self.sliders.append(hit_object)
             elif hit_type & 8:  # Spinner
-                self.spinners.append(hit_object)
\ No newline at end of file
+                self.spinners.append(hit_object)
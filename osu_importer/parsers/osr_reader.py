@@ -0,0 +1,133 @@
+# osu_importer/parsers/osr_reader.py
+
+import lzma
+import struct
+import numpy as np
+from collections import namedtuple
+
+HEADER_READ_SIZE = 1 << 14
+DOTNET_EPOCH_TICKS = 621355968000000000
+SEED_FRAME_DELTA = -12345
+SKIP_FRAME_POSITION = (256, -500)
+
+ReplayHeader = namedtuple("ReplayHeader", [
+    "mode", "game_version", "beatmap_md5", "username", "replay_md5",
+    "count_300", "count_100", "count_50", "count_geki", "count_katu", "count_miss",
+    "score", "max_combo", "perfect", "mods", "life_bar", "timestamp", "frames_offset", "frames_length",
+])
+
+COUNTS_STRUCT = struct.Struct("<hhhhhhih?i")
+
+def read_uleb128(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+def read_string(data, offset):
+    marker = data[offset]
+    offset += 1
+    if marker == 0x00:
+        return "", offset
+    if marker != 0x0B:
+        raise ValueError(f"Invalid string marker {marker:#x} at offset {offset - 1}")
+    length, offset = read_uleb128(data, offset)
+    if offset + length > len(data):
+        raise IndexError("String extends past the read data")
+    return data[offset:offset + length].decode('utf-8', errors='replace'), offset + length
+
+def ticks_to_unix_time(ticks):
+    return (ticks - DOTNET_EPOCH_TICKS) / 10_000_000 if ticks else 0.0
+
+def parse_osr_header(data):
+    mode, game_version = struct.unpack_from("<bi", data, 0)
+    offset = 5
+    beatmap_md5, offset = read_string(data, offset)
+    username, offset = read_string(data, offset)
+    replay_md5, offset = read_string(data, offset)
+
+    counts = COUNTS_STRUCT.unpack_from(data, offset)
+    offset += COUNTS_STRUCT.size
+
+    life_bar, offset = read_string(data, offset)
+    timestamp, frames_length = struct.unpack_from("<qi", data, offset)
+    offset += 12
+
+    return ReplayHeader(
+        mode, game_version, beatmap_md5, username, replay_md5,
+        *counts,
+        life_bar, ticks_to_unix_time(timestamp), offset, frames_length,
+    )
+
+def read_osr_header(osr_file_path):
+    # The header usually fits into the first block, the LZMA frame data after it is never read
+    with open(osr_file_path, 'rb') as file:
+        data = file.read(HEADER_READ_SIZE)
+        try:
+            return parse_osr_header(data)
+        except (IndexError, struct.error):
+            data += file.read()
+    return parse_osr_header(data)
+
+def split_frame_values(text):
+    payload = text.strip().strip(',')
+    if not payload:
+        return np.empty((0, 4), dtype=np.float64)
+
+    try:
+        values = np.array(payload.replace(',', '|').split('|'), dtype=np.float64)
+        if values.size == (payload.count(',') + 1) * 4:
+            return values.reshape(-1, 4)
+    except ValueError:
+        pass
+
+    # Malformed payloads fall back to per-frame parsing, frames with less than four values are dropped
+    rows = []
+    for entry in payload.split(','):
+        parts = entry.split('|')
+        if len(parts) < 4:
+            continue
+        try:
+            rows.append([float(part) for part in parts[:4]])
+        except ValueError:
+            continue
+    return np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+def decode_replay_frames(compressed):
+    # Matches lazer's legacy replay decoding: the seed frame does not advance time, the two stable
+    # skip frames at (256, -500) and frames with negative deltas are dropped but still advance time,
+    # which keeps replays with a skipped intro in sync
+    values = split_frame_values(lzma.decompress(compressed).decode('ascii', errors='replace'))
+    deltas = values[:, 0]
+    xs = values[:, 1]
+    ys = values[:, 2]
+
+    is_seed = deltas == SEED_FRAME_DELTA
+    seed = int(values[is_seed][0, 3]) if is_seed.any() else None
+
+    times = np.cumsum(np.where(is_seed, 0, deltas))
+    is_skip = (np.arange(len(values)) < 2) & (xs == SKIP_FRAME_POSITION[0]) & (ys == SKIP_FRAME_POSITION[1])
+    keep = ~is_seed & ~is_skip & (deltas >= 0)
+
+    times = np.rint(times[keep]).astype(np.int64)
+    frames = {
+        "time_deltas": np.diff(times, prepend=0),
+        "times": times,
+        "xs": xs[keep].astype(np.float32),
+        "ys": ys[keep].astype(np.float32),
+        "keys": (values[keep, 3].astype(np.int64) & 0xFF).astype(np.uint8),
+    }
+    return frames, seed
+
+def read_osr_frames(osr_file_path, header=None):
+    if header is None:
+        header = read_osr_header(osr_file_path)
+    with open(osr_file_path, 'rb') as file:
+        file.seek(header.frames_offset)
+        compressed = file.read(header.frames_length)
+    return decode_replay_frames(compressed)
@@ -1,81 +1,205 @@
 # # osu_importer/parsers/osu_parser.py
 
-import osrparse
+import abc
+import numpy as np
+from collections import namedtuple
+from functools import cached_property
+from osu_importer.utils.constants import KEY_FLAGS
+from osu_importer.parsers.beatmap_cache import beatmap_cache
+from osu_importer.parsers.osu_reader import OsuFileReader
+from osu_importer.parsers.osr_reader import read_osr_header, read_osr_frames
 
 class OsuParser:
-    _cache = {}
-
-    def __new__(cls, osu_file_path):
-        if osu_file_path in cls._cache:
-            return cls._cache[osu_file_path]
-        else:
-            instance = super(OsuParser, cls).__new__(cls)
-            cls._cache[osu_file_path] = instance
-            return instance
-
-    def __init__(self, osu_file_path):
-        if hasattr(self, 'initialized'):
-            return
-        self.initialized = True
+    CACHED_FIELDS = (
+        "audio_lead_in", "timing_points", "hitobject_tokens",
+        "difficulty_settings", "general_settings", "metadata", "events",
+    )
 
+    def __init__(self, osu_file_path, cache_dir=None, cache=beatmap_cache, lazy=False):
         self.osu_file_path = osu_file_path
-        self.audio_lead_in = 0
-        self.timing_points = []
-        self.hitobjects = []
-        self.difficulty_settings = {}
-        self.general_settings = {}
-        self.metadata = {}
-        self.events = []
-        self.parse_osu_file()
-        self.bpm = self.calculate_bpm()
-        self.total_hitobjects = len(self.hitobjects)
+        self.reader = None
+
+        # Lazy parsers keep the file mapped and decode each section on first access
+        if lazy:
+            self.open_reader()
+            return
+
+        state = cache.get(osu_file_path, cache_dir)
+        if state is not None:
+            for field in self.CACHED_FIELDS:
+                setattr(self, field, state[field])
+        elif self.parse_osu_file():
+            cache.put(osu_file_path, {field: getattr(self, field) for field in self.CACHED_FIELDS}, cache_dir)
+
+    def open_reader(self):
+        try:
+            self.reader = OsuFileReader(self.osu_file_path)
+        except OSError as e:
+            print(f"Error reading .osu file: {e}")
+            return False
+        return True
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
 
     def parse_osu_file(self):
+        if not self.open_reader():
+            return False
         try:
-            with open(self.osu_file_path, 'r', encoding='utf-8') as file:
-                section = None
-                for line in file:
-                    line = line.strip()
-                    if line.startswith('[') and line.endswith(']'):
-                        section = line[1:-1]
-                        continue
-                    if not line or line.startswith('//'):
-                        continue
-
-                    if section == 'General':
-                        key, value = line.split(':', 1)
-                        self.general_settings[key.strip()] = value.strip()
-                        if key.strip() == "AudioLeadIn":
-                            self.audio_lead_in = int(value.strip())
-                    elif section == 'Metadata':
-                        key, value = line.split(':', 1)
-                        self.metadata[key.strip()] = value.strip()
-                    elif section == 'Difficulty':
-                        key, value = line.split(':', 1)
-                        self.difficulty_settings[key.strip()] = value.strip()
-                    elif section == 'TimingPoints':
-                        parts = line.split(',')
-                        if len(parts) >= 2:
-                            offset, beat_length = float(parts[0]), float(parts[1])
-                            self.timing_points.append((offset, beat_length))
-                    elif section == 'HitObjects':
-                        self.hitobjects.append(line)
-                    elif section == 'Events':
-                        self.events.append(line)
+            for field in self.CACHED_FIELDS:
+                getattr(self, field)
         except Exception as e:
             print(f"Error parsing .osu file: {e}")
+            for field in self.CACHED_FIELDS:
+                self.__dict__.pop(field, None)
+            return False
+        finally:
+            self.close()
+        return True
+
+    def read_key_values(self, section):
+        return self.reader.key_values(section) if self.reader else {}
+
+    @cached_property
+    def general_settings(self):
+        return self.read_key_values("General")
+
+    @cached_property
+    def metadata(self):
+        return self.read_key_values("Metadata")
 
-    def calculate_bpm(self):
+    @cached_property
+    def difficulty_settings(self):
+        return self.read_key_values("Difficulty")
+
+    @cached_property
+    def audio_lead_in(self):
+        return int(self.general_settings.get("AudioLeadIn", 0))
+
+    @cached_property
+    def timing_points(self):
+        return self.reader.timing_points() if self.reader else []
+
+    @cached_property
+    def events(self):
+        return list(self.reader.iter_lines("Events")) if self.reader else []
+
+    @cached_property
+    def hitobject_tokens(self):
+        return list(self.reader.iter_hitobject_tokens()) if self.reader else []
+
+    @cached_property
+    def bpm(self):
         min_beat_length = min((beat_length for _, beat_length in self.timing_points if beat_length > 0), default=None)
         return 60000 / min_beat_length if min_beat_length else 0.0
 
+    @property
+    def total_hitobjects(self):
+        if self.reader is None or "hitobject_tokens" in self.__dict__:
+            return len(self.hitobject_tokens)
+        return self.reader.count_lines("HitObjects")
+
+    def iter_hitobject_tokens(self):
+        # Streams from the mapped file unless the tokens are already parsed or cached
+        if self.reader is None or "hitobject_tokens" in self.__dict__:
+            return iter(self.hitobject_tokens)
+        return self.reader.iter_hitobject_tokens()
+
+def read_osu_metadata(osu_file_path):
+    # Header sections, BPM and object count only, the hit objects are counted but never parsed
+    parser = OsuParser(osu_file_path, lazy=True)
+    if parser.reader is None:
+        return None
+    try:
+        return {
+            "md5": parser.reader.content_md5(),
+            "general_settings": parser.general_settings,
+            "metadata": parser.metadata,
+            "difficulty_settings": parser.difficulty_settings,
+            "bpm": parser.bpm,
+            "total_hitobjects": parser.total_hitobjects,
+        }
+    finally:
+        parser.close()
+
+ReplayFrame = namedtuple("ReplayFrame", ["time_delta", "x", "y", "keys"])
+
+class ReplayColumnsView(abc.ABC):
+    def __init__(self, osr_parser):
+        self.osr_parser = osr_parser
+
+    def __len__(self):
+        return len(self.osr_parser.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("replay frame index out of range")
+        return self.get_row(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_row(i)
+
+    @abc.abstractmethod
+    def get_row(self, index):
+        pass
+
+class ReplayDataView(ReplayColumnsView):
+    def get_row(self, index):
+        osr = self.osr_parser
+        return ReplayFrame(int(osr.time_deltas[index]), float(osr.xs[index]), float(osr.ys[index]), int(osr.keys[index]))
+
+class KeyPressesView(ReplayColumnsView):
+    def get_row(self, index):
+        osr = self.osr_parser
+        keys = int(osr.keys[index])
+        key_press = {
+            'time': int(osr.times[index]),
+            'time_delta': int(osr.time_deltas[index]),
+        }
+        for name, flag in KEY_FLAGS.items():
+            key_press[name] = bool(keys & flag)
+        return key_press
+
+def frame_column(name):
+    def getter(self):
+        if self.frames is None:
+            self.load_frames()
+        return self.frames[name]
+
+    return property(getter)
+
+def empty_frames():
+    return {
+        "time_deltas": np.empty(0, dtype=np.int64),
+        "times": np.empty(0, dtype=np.int64),
+        "xs": np.empty(0, dtype=np.float32),
+        "ys": np.empty(0, dtype=np.float32),
+        "keys": np.empty(0, dtype=np.uint8),
+    }
+
 class OsrParser:
-    def __init__(self, osr_file_path):
+    time_deltas = frame_column("time_deltas")
+    times = frame_column("times")
+    xs = frame_column("xs")
+    ys = frame_column("ys")
+    keys = frame_column("keys")
+
+    def __init__(self, osr_file_path, lazy=False):
         self.osr_file_path = osr_file_path
-        self.replay_data = None
+        self.replay_data = ReplayDataView(self)
+        self.key_presses = KeyPressesView(self)
+        self.header = None
+        self.frames = None
+        self.seed = None
         self.mods = 0
         self.mod_list = []
-        self.key_presses = []
         self.number_300s = 0
         self.number_100s = 0
         self.number_50s = 0
@@ -85,22 +209,36 @@ class OsrParser:
         self.username = "Unknown"
         self.parse_osr_file()
 
+        # Lazy parsers decode the frame stream on first access of replay_data, key_presses or a frame column
+        if not lazy:
+            self.load_frames()
+
     def parse_osr_file(self):
         try:
-            replay = osrparse.Replay.from_path(self.osr_file_path)
-            self.replay_data = replay.replay_data
-            self.mods = replay.mods
-            self.mod_list = self.get_mods_list(self.mods)
-            self.number_300s = replay.count_300
-            self.number_100s = replay.count_100
-            self.number_50s = replay.count_50
-            self.misses = replay.count_miss
-            self.max_combo = replay.max_combo
-            self.score = replay.score
-            self.username = replay.username
-            self.key_presses = self.parse_key_presses()
+            self.header = read_osr_header(self.osr_file_path)
         except Exception as e:
             print(f"Error parsing .osr file: {e}")
+            return False
+
+        self.mods = self.header.mods
+        self.mod_list = self.get_mods_list(self.mods)
+        self.number_300s = self.header.count_300
+        self.number_100s = self.header.count_100
+        self.number_50s = self.header.count_50
+        self.misses = self.header.count_miss
+        self.max_combo = self.header.max_combo
+        self.score = self.header.score
+        self.username = self.header.username
+        return True
+
+    def load_frames(self):
+        self.frames = empty_frames()
+        if self.header is None:
+            return
+        try:
+            self.frames, self.seed = read_osr_frames(self.osr_file_path, self.header)
+        except Exception as e:
+            print(f"Error parsing .osr replay frames: {e}")
 
     def calculate_accuracy(self):
         total_hits = self.number_300s + self.number_100s + self.number_50s + self.misses
@@ -117,18 +255,3 @@ class OsrParser:
             1 << 8: "HT",
         }
         return [name for val, name in mod_constants.items() if mods & val]
-
-    def parse_key_presses(self):
-        key_presses = []
-        total_time = 0
-        for frame in self.replay_data:
-            total_time += frame.time_delta
-            key_presses.append({
-                'time': total_time,
-                'time_delta': frame.time_delta,
-                'k1': bool(frame.keys & osrparse.utils.Key.K1),
-                'k2': bool(frame.keys & osrparse.utils.Key.K2),
-                'm1': bool(frame.keys & osrparse.utils.Key.M1),
-                'm2': bool(frame.keys & osrparse.utils.Key.M2),
-            })
-        return key_presses
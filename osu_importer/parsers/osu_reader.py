@@ -0,0 +1,113 @@
+# osu_importer/parsers/osu_reader.py
+
+import hashlib
+import mmap
+import re
+
+# Headers after the first line are searched from their preceding newline, which the regex engine
+# can skip to directly instead of trying every byte of the hit objects
+SECTION_HEADER = re.compile(rb"\n(?P<line>[ \t]*\[(?P<name>[A-Za-z]+)\][ \t]*\r?$)", re.MULTILINE)
+FIRST_SECTION_HEADER = re.compile(rb"(?P<line>[ \t]*\[(?P<name>[A-Za-z]+)\][ \t]*\r?$)", re.MULTILINE)
+IGNORED_LINE = re.compile(rb"\n[ \t\r\x0b\x0c]*(?=\n|//|\Z)")
+
+class OsuFileReader:
+    def __init__(self, osu_file_path):
+        self.osu_file_path = osu_file_path
+        with open(osu_file_path, 'rb') as file:
+            try:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self.data = b""
+        self.sections = {}
+        self.open_section = None
+        self.scan_position = 0
+        self.fully_indexed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = b""
+
+    def content_md5(self):
+        return hashlib.md5(self.data).hexdigest()
+
+    def index_sections(self, until=None):
+        # Headers are indexed incrementally, so the leading sections are available without
+        # scanning past them into the hit objects
+        while not self.fully_indexed and (until is None or until not in self.sections):
+            match = self.find_section_header(self.scan_position)
+            section_end = match.start("line") if match else len(self.data)
+            if self.open_section is not None:
+                self.sections.setdefault(self.open_section[0], (self.open_section[1], section_end))
+
+            if match is None:
+                self.fully_indexed = True
+                self.open_section = None
+            else:
+                self.open_section = (match.group("name").decode('ascii'), match.end())
+                self.scan_position = match.end()
+        return self.sections
+
+    def find_section_header(self, position):
+        if position == 0:
+            match = FIRST_SECTION_HEADER.match(self.data)
+            if match:
+                return match
+        return SECTION_HEADER.search(self.data, position)
+
+    def has_section(self, name):
+        return name in self.index_sections(name)
+
+    def iter_lines(self, name):
+        if not self.has_section(name):
+            return
+        start, end = self.sections[name]
+        data = self.data
+        position = start
+        while position < end:
+            line_end = data.find(b"\n", position, end)
+            if line_end == -1:
+                line_end = end
+            line = data[position:line_end].strip()
+            position = line_end + 1
+            if line and not line.startswith(b"//"):
+                yield line.decode('utf-8', errors='replace')
+
+    def count_lines(self, name):
+        if not self.has_section(name):
+            return 0
+        start, end = self.sections[name]
+        # Counted on the raw bytes: every line starts after a newline, blank and comment lines are subtracted
+        section = b"\n" + self.data[start:end]
+        return section.count(b"\n") - sum(1 for _ in IGNORED_LINE.finditer(section))
+
+    def key_values(self, name):
+        values = {}
+        for line in self.iter_lines(name):
+            key, separator, value = line.partition(':')
+            if separator:
+                values[key.strip()] = value.strip()
+        return values
+
+    def timing_points(self):
+        timing_points = []
+        for line in self.iter_lines("TimingPoints"):
+            parts = line.split(',')
+            if len(parts) >= 2:
+                timing_points.append((float(parts[0]), float(parts[1])))
+        return timing_points
+
+    def iter_hitobject_tokens(self):
+        for line in self.iter_lines("HitObjects"):
+            parts = line.split(',')
+            if len(parts) < 5:
+                continue
+            yield int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3]), int(parts[4]), tuple(parts[5:])
@@ -0,0 +1,37 @@
+# osu_importer/parsers/timing_points.py
+
+import bisect
+
+class TimingPointIndex:
+    DEFAULT_BEAT_LENGTH = 500
+
+    def __init__(self, timing_points):
+        self.offsets = []
+        self.beat_lengths = []
+        self.sv_multipliers = []
+
+        max_offset = float('-inf')
+        current_beat_length = None
+        inherited_multiplier = 1.0
+
+        for offset, beat_length in timing_points:
+            if beat_length < 0:
+                inherited_multiplier = -100 / beat_length
+            else:
+                current_beat_length = beat_length
+
+            # Running maximum keeps the lookup identical to a linear scan that stops at the first later offset
+            max_offset = max(max_offset, offset)
+            self.offsets.append(max_offset)
+            self.beat_lengths.append(current_beat_length)
+            self.sv_multipliers.append(inherited_multiplier)
+
+    def lookup(self, time_ms):
+        count = bisect.bisect_right(self.offsets, time_ms)
+        if count == 0:
+            return self.DEFAULT_BEAT_LENGTH, 1.0
+
+        beat_length = self.beat_lengths[count - 1]
+        if beat_length is None or beat_length <= 0:
+            beat_length = self.DEFAULT_BEAT_LENGTH
+        return beat_length, self.sv_multipliers[count - 1]
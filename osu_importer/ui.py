@@ -1,9 +1,17 @@
 # # osu_importer/ui.py
 
+import os
 import bpy
-from bpy.types import Panel, PropertyGroup, Operator
-from bpy.props import StringProperty, BoolProperty, FloatProperty, IntProperty, EnumProperty
-from osu_importer.utils.utils import update_quick_load, flip_objects, update_override_mods, update_dev_tools
+from bpy.types import Panel, PropertyGroup, Operator, UIList
+from bpy.props import StringProperty, BoolProperty, FloatProperty, IntProperty, EnumProperty, CollectionProperty
+from osu_importer.utils.utils import (update_quick_load, flip_objects, update_override_mods, update_dev_tools,
+                                      update_library_search, update_library_selection, update_osr_file,
+                                      update_osu_file)
+
+class OSULibraryEntry(PropertyGroup):
+    path: StringProperty(name="Path")
+    bpm: FloatProperty(name="BPM")
+    object_count: IntProperty(name="Objects")
 
 class OSUImporterProperties(PropertyGroup):
     # File Paths
@@ -11,13 +19,15 @@ class OSUImporterProperties(PropertyGroup):
         name="Beatmap (.osu) File",
         description="Path to the .osu beatmap file",
         default="",
-        subtype='FILE_PATH'
+        subtype='FILE_PATH',
+        update=update_osu_file
     )
     osr_file: StringProperty(
         name="Replay (.osr) File",
         description="Path to the .osr replay file",
         default="",
-        subtype='FILE_PATH'
+        subtype='FILE_PATH',
+        update=update_osr_file
     )
     # Import Type
     import_type: EnumProperty(
@@ -34,6 +44,11 @@ class OSUImporterProperties(PropertyGroup):
         description="Add Osu_Gameplay mesh and Geometry Nodes setup",
         default=True
     )
+    instance_hit_objects: BoolProperty(
+        name="Instanced Hit Objects",
+        description="Import circles, spinners and approach circles as one point cloud per type instead of one object per hit object",
+        default=False
+    )
     # Import Options
     import_approach_circles: BoolProperty(
         name="Approach Circles",
@@ -78,6 +93,20 @@ class OSUImporterProperties(PropertyGroup):
         min=4,
         max=50
     )
+    adaptive_slider_sampling: BoolProperty(
+        name="Adaptive Slider Sampling",
+        description="Sample slider paths by curvature instead of a fixed number of points per segment",
+        default=True
+    )
+    slider_tolerance: FloatProperty(
+        name="Slider Tolerance",
+        description="Maximum deviation in osu! pixels between the sampled slider path and the exact curve",
+        default=0.25,
+        min=0.05,
+        max=5.0,
+        step=0.05,
+        precision=2
+    )
     approach_circle_bevel_depth: FloatProperty(
         name="Bevel Depth",
         description="Adjust the bevel depth of approach circles in FULL import",
@@ -119,6 +148,40 @@ class OSUImporterProperties(PropertyGroup):
         step=0.05,
         precision=2
     )
+    cursor_max_error: FloatProperty(
+        name="Max Cursor Error",
+        description="Maximum distance in osu! pixels between the decimated and the recorded cursor path. 0 keeps every replay event",
+        default=0.5,
+        min=0.0,
+        max=10.0
+    )
+    # Time Window
+    use_time_window: BoolProperty(
+        name="Time Window",
+        description="Only import hit objects and cursor movement inside a time range",
+        default=False
+    )
+    time_window_unit: EnumProperty(
+        name="Unit",
+        description="Unit of the time window bounds",
+        items=[
+            ('SECONDS', "Seconds", "Bounds are video time in seconds"),
+            ('FRAMES', "Frames", "Bounds are scene frames"),
+        ],
+        default='SECONDS'
+    )
+    time_window_start: FloatProperty(
+        name="Start",
+        description="Start of the imported range. Objects appearing within their preempt time are included",
+        default=0.0,
+        min=0.0
+    )
+    time_window_end: FloatProperty(
+        name="End",
+        description="End of the imported range",
+        default=20.0,
+        min=0.0
+    )
     # Audio Options
     import_audio: BoolProperty(
         name="Audio Track",
@@ -212,6 +275,52 @@ class OSUImporterProperties(PropertyGroup):
         description="Automatically create basic shaders for imported elements",
         default=False,
     )
+    persistent_beatmap_cache: BoolProperty(
+        name="Persistent Beatmap Cache",
+        description="Store parsed beatmaps on disk so re-importing the same difficulty skips parsing",
+        default=False,
+    )
+    # Beatmap Library
+    songs_folder: StringProperty(
+        name="Songs Folder",
+        description="osu! Songs directory indexed by the beatmap library",
+        subtype='DIR_PATH',
+        default="",
+    )
+    replays_folder: StringProperty(
+        name="Replays Folder",
+        description="osu! Replays directory indexed to match replays with their beatmaps",
+        subtype='DIR_PATH',
+        default="",
+    )
+    library_search: StringProperty(
+        name="Search",
+        description="Search indexed beatmaps by title, artist, mapper or difficulty",
+        default="",
+        update=update_library_search
+    )
+    library_results: CollectionProperty(type=OSULibraryEntry)
+    library_results_index: IntProperty(
+        name="Selected Beatmap",
+        default=-1,
+        update=update_library_selection
+    )
+    enable_profiling: BoolProperty(
+        name="Profile Imports",
+        description="Record timings and counters of each import and write a JSON report and Chrome trace",
+        default=False,
+    )
+    profile_with_cprofile: BoolProperty(
+        name="cProfile",
+        description="Additionally capture a cProfile of the import (slower, writes a .prof file)",
+        default=False,
+    )
+    profile_output_dir: StringProperty(
+        name="Profile Output",
+        description="Directory for import profiles, empty uses the add-on data directory",
+        subtype='DIR_PATH',
+        default="",
+    )
     #Override Mods
     override_mods: BoolProperty(
         name="Override Mods",
@@ -276,6 +385,7 @@ class OSU_PT_ImporterPanel(Panel):
             # Standard File Selection
             box.prop(props, "osu_file")
             box.prop(props, "osr_file")
+        box.operator("osu_importer.find_beatmap", text="Find Beatmap for Replay", icon='VIEWZOOM')
 
         box.separator()
         box.operator("osu_importer.import", text="Import", icon='IMPORT')
@@ -393,6 +503,24 @@ class OSU_PT_ToolsPanel(Panel):
         row.operator("osu_importer.flip_map_horizontal", text="Flip Map Horizontal", icon='ARROW_LEFTRIGHT')
         row.operator("osu_importer.flip_map_vertical", text="Flip Map Vertical", icon='EVENT_DOWN_ARROW')
 
+        # Beatmap Cache
+        col.separator()
+        col.label(text="Beatmap Cache:", icon='FILE_CACHE')
+        row = col.row(align=True)
+        row.prop(props, "persistent_beatmap_cache", text="Persistent Cache", toggle=True)
+        row.operator("osu_importer.clear_beatmap_cache", text="Clear Cache", icon='TRASH')
+
+        # Profiling
+        col.separator()
+        col.label(text="Profiling:", icon='TIME')
+        row = col.row(align=True)
+        row.prop(props, "enable_profiling", text="Profile Imports", toggle=True)
+        sub = row.row(align=True)
+        sub.enabled = props.enable_profiling
+        sub.prop(props, "profile_with_cprofile", text="cProfile", toggle=True)
+        if props.enable_profiling:
+            col.prop(props, "profile_output_dir", text="")
+
         # Dev Tools Toggle
         col.separator()
         col.prop(props, "dev_tools", text="Enable Dev Tools", toggle=True)
@@ -422,6 +550,34 @@ class OSU_PT_ToolsPanel(Panel):
                 dev_box.prop(props, "override_relax", toggle=True)
                 dev_box.prop(props, "override_cinema", toggle=True)
 
+class OSU_UL_LibraryResults(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='FILE')
+        row.label(text=f"{item.bpm:.0f} BPM, {item.object_count} Objects")
+
+class OSU_PT_LibraryPanel(Panel):
+    bl_label = "Beatmap Library"
+    bl_idname = "OSU_PT_library_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "osu! Importer"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.osu_importer_props
+
+        col = layout.column(align=True)
+        col.prop(props, "songs_folder")
+        col.operator("osu_importer.scan_library", text="Scan Songs Folder", icon='FILE_REFRESH')
+        col.separator()
+        col.prop(props, "replays_folder")
+        col.operator("osu_importer.scan_replays", text="Scan Replays Folder", icon='FILE_REFRESH')
+
+        layout.prop(props, "library_search", text="", icon='VIEWZOOM')
+        layout.template_list("OSU_UL_LibraryResults", "", props, "library_results", props, "library_results_index", rows=6)
+
 class OSU_PT_ImportOptionsPanel(Panel):
     bl_label = "Import Options"
     bl_idname = "OSU_PT_import_options_panel"
@@ -442,6 +598,7 @@ class OSU_PT_ImportOptionsPanel(Panel):
         # import_type 'BASE'
         if props.import_type == 'BASE':
             box.prop(props, "include_osu_gameplay", toggle=True)
+            box.prop(props, "instance_hit_objects", toggle=True)
 
         # Hit Objects Import Options
         col = box.column(align=True)
@@ -459,7 +616,11 @@ class OSU_PT_ImportOptionsPanel(Panel):
         if props.import_sliders:
             col.separator()
             col.label(text="Slider Options:", icon='MOD_CURVE')
-            col.prop(props, "slider_resolution")
+            col.prop(props, "adaptive_slider_sampling", toggle=True)
+            if props.adaptive_slider_sampling:
+                col.prop(props, "slider_tolerance")
+            else:
+                col.prop(props, "slider_resolution")
             row = col.row(align=True)
             if props.import_type == 'FULL':
                 row.prop(props, "import_slider_heads_tails", toggle=True)
@@ -471,11 +632,9 @@ class OSU_PT_ImportOptionsPanel(Panel):
                 col.separator()
                 warning_box = col.box()
                 warning_row = warning_box.row(align=True)
-                warning_row.label(text="⚠️  WARNING  ⚠️", icon='NONE')
-                warning_row = warning_box.row(align=True)
-                warning_row.label(text="Slider Ticks are NOT recommended!", icon='NONE')
+                warning_row.label(text="Ticks follow the slider path every 100 ms.", icon='INFO')
                 warning_row = warning_box.row(align=True)
-                warning_row.label(text="This can lead to too many objects.", icon='NONE')
+                warning_row.label(text="Each tick is its own object.", icon='NONE')
 
 
         col.label(text="Cursor Movements:", icon='CURSOR')
@@ -484,12 +643,117 @@ class OSU_PT_ImportOptionsPanel(Panel):
             col.prop(props, "cursor_shape")
         if props.import_cursors:
             col.prop(props, "cursor_size", text="Cursor Size")
+            col.prop(props, "cursor_max_error")
+
+        # Time Window
+        col.separator()
+        col.label(text="Time Window:", icon='TIME')
+        col.prop(props, "use_time_window", toggle=True)
+        if props.use_time_window:
+            col.prop(props, "time_window_unit", expand=True)
+            row = col.row(align=True)
+            row.prop(props, "time_window_start")
+            row.prop(props, "time_window_end")
 
         # Audio Options
         col.separator()
         col.label(text="Audio Options:", icon='SPEAKER')
         col.prop(props, "import_audio", toggle=True)
 
+class OSU_OT_ClearBeatmapCache(Operator):
+    bl_idname = "osu_importer.clear_beatmap_cache"
+    bl_label = "Clear Beatmap Cache"
+    bl_description = "Remove all cached beatmaps from memory and disk"
+
+    def execute(self, context):
+        from .parsers.beatmap_cache import beatmap_cache
+        from .utils.utils import get_beatmap_cache_dir
+
+        try:
+            beatmap_cache.clear(get_beatmap_cache_dir())
+        except OSError as e:
+            self.report({'ERROR'}, f"Error clearing beatmap cache: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, "Beatmap cache cleared.")
+        return {'FINISHED'}
+
+class OSU_OT_ScanLibrary(Operator):
+    bl_idname = "osu_importer.scan_library"
+    bl_label = "Scan Songs Folder"
+    bl_description = "Index all beatmaps in the Songs folder, only changed files are read again"
+
+    def execute(self, context):
+        from .library_index import LibraryIndex
+        from .utils.utils import get_library_index_path, refresh_library_results
+
+        props = context.scene.osu_importer_props
+        songs_folder = bpy.path.abspath(props.songs_folder)
+        if not songs_folder or not os.path.isdir(songs_folder):
+            self.report({'ERROR'}, "Please select an existing osu! Songs folder.")
+            return {'CANCELLED'}
+
+        try:
+            with LibraryIndex(get_library_index_path()) as index:
+                result = index.scan_songs(songs_folder)
+        except Exception as e:
+            self.report({'ERROR'}, f"Error scanning Songs folder: {e}")
+            return {'CANCELLED'}
+
+        refresh_library_results(props)
+        self.report({'INFO'}, f"Indexed {result.total} beatmaps ({result.updated} updated, "
+                              f"{result.removed} removed, {result.failed} failed).")
+        return {'FINISHED'}
+
+class OSU_OT_ScanReplays(Operator):
+    bl_idname = "osu_importer.scan_replays"
+    bl_label = "Scan Replays Folder"
+    bl_description = "Index the headers of all replays in the Replays folder, only changed files are read again"
+
+    def execute(self, context):
+        from .library_index import LibraryIndex
+        from .utils.utils import get_library_index_path
+
+        props = context.scene.osu_importer_props
+        replays_folder = bpy.path.abspath(props.replays_folder)
+        if not replays_folder or not os.path.isdir(replays_folder):
+            self.report({'ERROR'}, "Please select an existing osu! Replays folder.")
+            return {'CANCELLED'}
+
+        try:
+            with LibraryIndex(get_library_index_path()) as index:
+                result = index.scan_replays(replays_folder)
+        except Exception as e:
+            self.report({'ERROR'}, f"Error scanning Replays folder: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Indexed {result.total} replays ({result.updated} updated, "
+                              f"{result.removed} removed, {result.failed} failed).")
+        return {'FINISHED'}
+
+class OSU_OT_FindBeatmap(Operator):
+    bl_idname = "osu_importer.find_beatmap"
+    bl_label = "Find Beatmap for Replay"
+    bl_description = "Look up the replay's beatmap MD5 in the beatmap library and set the .osu file"
+
+    def execute(self, context):
+        from .utils.utils import find_beatmap_for_replay
+
+        props = context.scene.osu_importer_props
+        osr_file_path = bpy.path.abspath(props.osr_file)
+        if not os.path.isfile(osr_file_path):
+            self.report({'ERROR'}, "Please specify an existing .osr file.")
+            return {'CANCELLED'}
+
+        osu_file_path = find_beatmap_for_replay(osr_file_path)
+        if osu_file_path is None:
+            self.report({'WARNING'}, "Beatmap not found in the library, scan your Songs folder first.")
+            return {'CANCELLED'}
+
+        props.osu_file = osu_file_path
+        self.report({'INFO'}, f"Beatmap found: {os.path.basename(osu_file_path)}")
+        return {'FINISHED'}
+
 class OSU_OT_Import(Operator):
     bl_idname = "osu_importer.import"
     bl_label = "Import"
@@ -500,6 +764,12 @@ class OSU_OT_Import(Operator):
         props = context.scene.osu_importer_props
 
         try:
+            if props.osr_file and not props.osu_file:
+                from .utils.utils import find_beatmap_for_replay
+                osu_file_path = find_beatmap_for_replay(bpy.path.abspath(props.osr_file))
+                if osu_file_path:
+                    props.osu_file = osu_file_path
+
             if not (props.osu_file and props.osr_file):
                 self.report({'ERROR'}, "Please specify both .osu and .osr files.")
                 return {'CANCELLED'}
@@ -41,3 +41,19 @@ MOD_FLAGS = {
 # Spinner center positions
 SPINNER_CENTER_X = 256
 SPINNER_CENTER_Y = 192
+
+# Replay key bits
+KEY_M1 = 1 << 0
+KEY_M2 = 1 << 1
+KEY_K1 = 1 << 2
+KEY_K2 = 1 << 3
+KEY_SMOKE = 1 << 4
+
+KEY_FLAGS = {
+    "k1": KEY_K1,
+    "k2": KEY_K2,
+    "m1": KEY_M1,
+    "m2": KEY_M2,
+}
+
+KEY_ANY = KEY_M1 | KEY_M2 | KEY_K1 | KEY_K2
@@ -0,0 +1,24 @@
+# osu_importer/utils/coordinates.py
+
+import numpy as np
+from osu_importer.utils.constants import SCALE_FACTOR
+
+def map_osu_to_blender(x, y):
+    if not hasattr(map_osu_to_blender, 'cache'):
+        map_osu_to_blender.cache = {}
+    key = (x, y)
+    if key in map_osu_to_blender.cache:
+        return map_osu_to_blender.cache[key]
+    corrected_x = (x - 256) * SCALE_FACTOR  # Centering on zero
+    corrected_y = 0
+    corrected_z = (192 - y) * SCALE_FACTOR  # Invert and center
+    map_osu_to_blender.cache[key] = (corrected_x, corrected_y, corrected_z)
+    return corrected_x, corrected_y, corrected_z
+
+def map_osu_to_blender_array(xs, ys):
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    locations = np.zeros((len(xs), 3), dtype=np.float64)
+    locations[:, 0] = (xs - 256) * SCALE_FACTOR
+    locations[:, 2] = (192 - ys) * SCALE_FACTOR
+    return locations
@@ -0,0 +1,52 @@
+# osu_importer/utils/decimation.py
+
+import numpy as np
+
+def state_change_mask(states):
+    states = np.asarray(states)
+    mask = np.zeros(len(states), dtype=bool)
+    if len(states):
+        mask[1:] = states[1:] != states[:-1]
+    return mask
+
+def decimate_path(times, xs, ys, max_error, keep=None):
+    # Ramer-Douglas-Peucker in time-position space: the error of a dropped sample is its distance
+    # to the linearly interpolated position at the same time, i.e. what the LINEAR F-Curves will show
+    times = np.asarray(times, dtype=np.float64)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+
+    count = len(times)
+    if count <= 2 or max_error <= 0:
+        return np.arange(count)
+
+    mask = np.zeros(count, dtype=bool)
+    mask[0] = mask[-1] = True
+    if keep is not None:
+        mask |= keep
+
+    anchors = np.flatnonzero(mask)
+    stack = list(zip(anchors[:-1].tolist(), anchors[1:].tolist()))
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        duration = times[end] - times[start]
+        if duration > 0:
+            fraction = (times[start + 1:end] - times[start]) / duration
+        else:
+            fraction = np.zeros(end - start - 1)
+
+        error = np.hypot(
+            xs[start + 1:end] - (xs[start] + fraction * (xs[end] - xs[start])),
+            ys[start + 1:end] - (ys[start] + fraction * (ys[end] - ys[start]))
+        )
+        worst = int(np.argmax(error))
+        if error[worst] > max_error:
+            split = start + 1 + worst
+            mask[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return np.flatnonzero(mask)
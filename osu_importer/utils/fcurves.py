@@ -0,0 +1,127 @@
+# osu_importer/utils/fcurves.py
+
+import bpy
+import numpy as np
+from osu_importer.utils.profiling import profiler
+
+INTERPOLATION_MODES = {
+    'CONSTANT': 0,
+    'LINEAR': 1,
+    'BEZIER': 2,
+}
+
+def get_or_create_action(id_data):
+    anim_data = id_data.animation_data or id_data.animation_data_create()
+    if anim_data.action is None:
+        anim_data.action = bpy.data.actions.new(name=f"{id_data.name}Action")
+    return anim_data.action
+
+def modifier_socket_path(modifier, socket_name):
+    return f'modifiers["{modifier.name}"]["{socket_name}"]'
+
+def sort_keyframes(frames, values):
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if frames.size == 0:
+        return frames, values
+
+    order = np.argsort(frames, kind='stable')
+    frames = frames[order]
+    values = values[order]
+
+    # keyframe_insert overwrites existing keys on the same frame, keep the last value per frame
+    keep = np.append(frames[1:] != frames[:-1], True)
+    return frames[keep], values[keep]
+
+def drop_repeated_values(frames, values):
+    # With CONSTANT interpolation a key that repeats the previous value changes nothing
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return frames[keep], values[keep]
+
+def write_fcurve(action, data_path, frames, values, index=0, interpolation='LINEAR', group=""):
+    frames, values = sort_keyframes(frames, values)
+
+    fcurve = action.fcurves.find(data_path, index=index)
+    profiler.count("rna_calls")
+    if fcurve is not None:
+        existing_count = len(fcurve.keyframe_points)
+        if existing_count:
+            existing = np.empty(existing_count * 2, dtype=np.float32)
+            fcurve.keyframe_points.foreach_get("co", existing)
+            profiler.count("rna_calls")
+            frames, values = sort_keyframes(
+                np.concatenate((existing[0::2], frames)),
+                np.concatenate((existing[1::2], values))
+            )
+        action.fcurves.remove(fcurve)
+        profiler.count("rna_calls")
+
+    if interpolation == 'CONSTANT':
+        frames, values = drop_repeated_values(frames, values)
+
+    fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+    profiler.count("rna_calls")
+
+    count = len(frames)
+    if count == 0:
+        return fcurve
+
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+
+    keyframe_points = fcurve.keyframe_points
+    keyframe_points.add(count)
+    profiler.count("rna_calls")
+    keyframe_points.foreach_set("co", co)
+    profiler.count("rna_calls")
+    keyframe_points.foreach_set(
+        "interpolation",
+        np.full(count, INTERPOLATION_MODES[interpolation], dtype=np.int32)
+    )
+    profiler.count("rna_calls")
+    fcurve.update()
+    profiler.count("rna_calls")
+    profiler.count("fcurves_written")
+    profiler.count("keyframes_written", count)
+    return fcurve
+
+def write_vector_fcurves(action, data_path, frames, vectors, interpolation='LINEAR', group=""):
+    vectors = np.asarray(vectors, dtype=np.float64)
+    return [
+        write_fcurve(action, data_path, frames, vectors[:, axis], index=axis,
+                     interpolation=interpolation, group=group)
+        for axis in range(vectors.shape[1])
+    ]
+
+class TrackBuilder:
+    def __init__(self, group=""):
+        self.group = group
+        self.tracks = []
+
+    def add(self, data_path, keyframes, index=0, interpolation='LINEAR'):
+        frames = [frame for frame, _ in keyframes]
+        values = [float(value) for _, value in keyframes]
+        self.tracks.append((data_path, index, frames, values, interpolation))
+
+    def step(self, data_path, keyframes, index=0):
+        self.add(data_path, keyframes, index, 'CONSTANT')
+
+    def linear(self, data_path, keyframes, index=0):
+        self.add(data_path, keyframes, index, 'LINEAR')
+
+    def vector(self, data_path, keyframes, interpolation='LINEAR'):
+        if not keyframes:
+            return
+        for axis in range(len(keyframes[0][1])):
+            self.add(data_path, [(frame, value[axis]) for frame, value in keyframes], axis, interpolation)
+
+    def write(self, id_data):
+        if not self.tracks:
+            return None
+        action = get_or_create_action(id_data)
+        for data_path, index, frames, values, interpolation in self.tracks:
+            write_fcurve(action, data_path, frames, values, index=index, interpolation=interpolation,
+                         group=self.group)
+        return action
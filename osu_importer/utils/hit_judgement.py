@@ -0,0 +1,64 @@
+# osu_importer/utils/hit_judgement.py
+
+import numpy as np
+from osu_importer.utils.constants import KEY_ANY
+
+def sort_replay_keys(key_times, keys):
+    order = np.argsort(key_times, kind='stable')
+    return np.asarray(key_times, dtype=np.float64)[order], np.asarray(keys, dtype=np.uint8)[order] & KEY_ANY
+
+def press_edge_times(sorted_times, sorted_keys):
+    previous_keys = np.concatenate((np.zeros(1, dtype=np.uint8), sorted_keys[:-1]))
+    newly_pressed = sorted_keys & ~previous_keys
+    return sorted_times[newly_pressed != 0]
+
+def judge_hits(object_times, end_times, hit_types, key_times, keys, hit_window):
+    object_times = np.asarray(object_times, dtype=np.float64)
+    end_times = np.asarray(end_times, dtype=np.float64)
+    hit_types = np.asarray(hit_types, dtype=np.int64)
+
+    count = len(object_times)
+    was_hit = np.zeros(count, dtype=bool)
+    was_completed = np.zeros(count, dtype=bool)
+    hit_offsets = np.full(count, np.nan, dtype=np.float64)
+
+    if count == 0 or len(key_times) == 0:
+        return was_hit, was_completed, hit_offsets
+
+    is_circle = (hit_types & 1) != 0
+    is_slider = ~is_circle & ((hit_types & 2) != 0)
+    is_spinner = ~is_circle & ~is_slider & ((hit_types & 8) != 0)
+
+    sorted_times, sorted_keys = sort_replay_keys(key_times, keys)
+    window_start = object_times - hit_window
+    window_end = np.where(is_circle, object_times, end_times) + hit_window
+
+    # Circles and sliders need a fresh key press inside the window, which for sliders lasts until their end
+    edges = press_edge_times(sorted_times, sorted_keys)
+    edge_start = np.searchsorted(edges, window_start, side='left')
+    edge_end = np.searchsorted(edges, window_end, side='right')
+    pressed = edge_end > edge_start
+    clicked = (is_circle | is_slider) & pressed
+    was_hit[clicked] = True
+
+    # The offset is only measured for presses around the object's start time
+    head_end = np.searchsorted(edges, object_times + hit_window, side='right')
+    on_time = clicked & (head_end > edge_start)
+    hit_offsets[on_time] = edges[edge_start[on_time]] - object_times[on_time]
+
+    # Spinners accept keys that are already held when the spinner starts
+    held = sorted_keys != 0
+    held_count = np.concatenate(([0], np.cumsum(held)))
+    frame_start = np.searchsorted(sorted_times, window_start, side='left')
+    frame_end = np.searchsorted(sorted_times, window_end, side='right')
+    spun = is_spinner & (held_count[frame_end] > held_count[frame_start])
+    was_hit[spun] = True
+
+    # Hit sliders and spinners count as completed when a key is still held at their end.
+    # Whether the cursor followed the slider ball is not judged.
+    end_frame_idx = np.searchsorted(sorted_times, end_times, side='left')
+    last_frame_held = held[np.clip(end_frame_idx - 1, 0, len(held) - 1)]
+    reached_end = (end_frame_idx > 0) & (end_frame_idx < len(sorted_times)) & last_frame_held
+    was_completed[:] = (is_slider | is_spinner) & was_hit & reached_end
+
+    return was_hit, was_completed, hit_offsets
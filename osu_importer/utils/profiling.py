@@ -0,0 +1,164 @@
+# osu_importer/utils/profiling.py
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+from collections import Counter
+
+PROFILE_TOP_FUNCTIONS = 30
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    __slots__ = ("profiler", "name", "args", "start", "end", "children")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = None
+        self.end = None
+        self.children = []
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        stack[-1].children.append(self)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end = time.perf_counter()
+        self.profiler.stack.pop()
+        if exc_type is not None:
+            self.args = dict(self.args, error=repr(exc_val))
+        return False
+
+    @property
+    def duration(self):
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+    def to_dict(self, origin):
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "args": self.args,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.root = None
+        self.stack = []
+        self.counters = Counter()
+        self.profile = None
+
+    def start(self, name, /, use_cprofile=False, **args):
+        self.reset()
+        self.root = Span(self, name, args)
+        self.root.start = time.perf_counter()
+        self.stack.append(self.root)
+        if use_cprofile:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled:
+            return None
+        self.enabled = False
+        if self.profile is not None:
+            self.profile.disable()
+        self.root.end = time.perf_counter()
+        self.stack = []
+        return self.report()
+
+    def span(self, name, /, **args):
+        # Disabled profiling hands out one shared no-op context manager
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def report(self):
+        report = {
+            "name": self.root.name,
+            "duration_ms": round(self.root.duration * 1000, 3),
+            "counters": dict(self.counters),
+            "spans": self.root.to_dict(self.root.start),
+        }
+        if self.profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+            report["profile"] = stream.getvalue()
+        return report
+
+    def chrome_trace(self):
+        origin = self.root.start
+        events = []
+
+        def add_span(span, depth):
+            events.append({
+                "name": span.name,
+                "cat": "osu_importer",
+                "ph": "X",
+                "ts": round((span.start - origin) * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": 1,
+                "tid": 1,
+                "args": dict(span.args, depth=depth),
+            })
+            for child in span.children:
+                add_span(child, depth + 1)
+
+        add_span(self.root, 0)
+        end_ts = round(self.root.duration * 1e6, 3)
+        for name, value in self.counters.items():
+            events.append({"name": name, "ph": "C", "ts": end_ts, "pid": 1, "tid": 1, "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, directory, basename):
+        os.makedirs(directory, exist_ok=True)
+        report_path = os.path.join(directory, f"{basename}.report.json")
+        trace_path = os.path.join(directory, f"{basename}.trace.json")
+
+        with open(report_path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=2, default=str)
+        with open(trace_path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file, default=str)
+        if self.profile is not None:
+            self.profile.dump_stats(os.path.join(directory, f"{basename}.prof"))
+        return report_path, trace_path
+
+    def print_summary(self, max_depth=2):
+        def print_span(span, depth):
+            print(f"[osu! Importer] {'  ' * depth}{span.name}: {span.duration:.4f} s")
+            if depth < max_depth:
+                for child in span.children:
+                    print_span(child, depth + 1)
+
+        print_span(self.root, 0)
+        for name, value in sorted(self.counters.items()):
+            print(f"[osu! Importer]   {name}: {value}")
+
+profiler = Profiler()
@@ -0,0 +1,182 @@
+# osu_importer/utils/slider_curves.py
+
+import math
+from functools import lru_cache
+import numpy as np
+
+SLIDER_TOLERANCE = 0.25  # osu! pixels, same flattening tolerance the game uses
+MAX_CURVE_SEGMENTS = 1000
+
+@lru_cache(maxsize=256)
+def bernstein_basis(degree, num_points):
+    t = np.linspace(0.0, 1.0, num_points + 1)[:, None]
+    i = np.arange(degree + 1)
+    binomials = np.array([math.comb(degree, k) for k in range(degree + 1)], dtype=np.float64)
+    basis = binomials * t ** i * (1.0 - t) ** (degree - i)
+    basis.setflags(write=False)
+    return basis
+
+def evaluate_bezier(control_points, num_points):
+    control_points = np.asarray(control_points, dtype=np.float64)
+    return bernstein_basis(len(control_points) - 1, num_points) @ control_points
+
+def estimate_segment_count(control_points, tolerance):
+    # Bound on the distance between a Bezier curve and its uniformly sampled polyline:
+    # n(n-1)/8 * max|P[i-1] - 2P[i] + P[i+1]| / segments^2
+    degree = control_points.shape[-2] - 1
+    if degree < 2:
+        return np.ones(control_points.shape[:-2], dtype=np.int64)
+    second_differences = control_points[..., :-2, :] - 2 * control_points[..., 1:-1, :] + control_points[..., 2:, :]
+    bend = np.sqrt(np.einsum('...ij,...ij->...i', second_differences, second_differences).max(axis=-1))
+    segments = np.ceil(np.sqrt(degree * (degree - 1) * bend / (8 * tolerance)))
+    return np.clip(segments, 1, MAX_CURVE_SEGMENTS).astype(np.int64)
+
+def flatten_bezier(control_points, tolerance=SLIDER_TOLERANCE):
+    control_points = np.asarray(control_points, dtype=np.float64)
+    return evaluate_bezier(control_points, int(estimate_segment_count(control_points, tolerance)))
+
+def circle_through_points(p1, p2, p3):
+    temp = p2 - p1
+    temp2 = p3 - p1
+    a = temp @ temp
+    c = temp2 @ temp2
+    d = 2 * (temp[0] * temp2[1] - temp[1] * temp2[0])
+    if d == 0:
+        return None, 0.0
+    center = np.array((
+        p1[0] + (temp2[1] * a - temp[1] * c) / d,
+        p1[1] + (temp[0] * c - temp2[0] * a) / d,
+    ))
+    return center, float(np.linalg.norm(p1 - center))
+
+def flatten_perfect_circle(points, tolerance=SLIDER_TOLERANCE, num_points=None):
+    points = np.asarray(points, dtype=np.float64)
+    p1, p2, p3 = points[:3]
+    center, radius = circle_through_points(p1, p2, p3)
+    if center is None:
+        return None
+
+    angle_start = math.atan2(p1[1] - center[1], p1[0] - center[0])
+    angle_end = math.atan2(p3[1] - center[1], p3[0] - center[0])
+    cross = (p2[0] - p1[0]) * (p3[1] - p2[1]) - (p2[1] - p1[1]) * (p3[0] - p2[0])
+    if cross < 0:
+        if angle_end > angle_start:
+            angle_end -= 2 * math.pi
+    else:
+        if angle_end < angle_start:
+            angle_end += 2 * math.pi
+
+    if num_points is None:
+        if tolerance >= 2 * radius:
+            num_points = 2
+        else:
+            step = 2 * math.acos(1 - tolerance / radius)
+            num_points = min(MAX_CURVE_SEGMENTS, max(2, math.ceil(abs(angle_end - angle_start) / step)))
+
+    angles = angle_start + np.linspace(0.0, 1.0, num_points + 1) * (angle_end - angle_start)
+    return np.column_stack((center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)))
+
+def flatten_catmull_rom(points, tolerance=SLIDER_TOLERANCE, num_points=None):
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 2:
+        return points
+
+    # Every piece is a cubic Bezier from points[i] to points[i + 1], the ends repeat their outer point
+    padded = np.vstack((points[:1], points, points[-1:]))
+    p0, p1, p2, p3 = padded[:-3], padded[1:-2], padded[2:-1], padded[3:]
+    pieces = np.stack((p1, p1 + (p2 - p0) / 6, p2 - (p3 - p1) / 6, p2), axis=1)
+
+    if num_points is None:
+        counts = estimate_segment_count(pieces, tolerance)
+    else:
+        counts = np.full(len(pieces), num_points, dtype=np.int64)
+
+    # All pieces are sampled in one batch, the shared end points are only emitted once
+    piece_index = np.repeat(np.arange(len(pieces)), counts)
+    t = (np.arange(len(piece_index)) - np.repeat(np.cumsum(counts) - counts, counts)) / counts[piece_index]
+    t = np.append(t, 1.0)
+    piece_index = np.append(piece_index, len(pieces) - 1)
+
+    u = 1.0 - t
+    basis = np.column_stack((u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t))
+    return np.einsum('ij,ijk->ik', basis, pieces[piece_index])
+
+def split_segments(control_points):
+    segments = []
+    current_segment = [control_points[0]]
+    for i in range(1, len(control_points)):
+        if tuple(control_points[i]) == tuple(control_points[i - 1]):
+            segments.append(current_segment)
+            current_segment = [control_points[i]]
+        else:
+            current_segment.append(control_points[i])
+    if current_segment:
+        segments.append(current_segment)
+    return segments
+
+def flatten_segment(curve_type, segment, tolerance=SLIDER_TOLERANCE, num_points=None):
+    segment = np.asarray(segment, dtype=np.float64)
+    if len(segment) < 2 or curve_type == "L":
+        return segment
+    if curve_type == "P" and len(segment) == 3:
+        arc = flatten_perfect_circle(segment, tolerance, num_points)
+        if arc is not None:
+            return arc
+    if curve_type == "C":
+        return flatten_catmull_rom(segment, tolerance, num_points)
+    if curve_type in ("B", "P"):
+        if num_points is None:
+            return flatten_bezier(segment, tolerance)
+        return evaluate_bezier(segment, num_points)
+    return segment
+
+def remove_duplicate_points(points, epsilon=1e-6):
+    if len(points) < 2:
+        return points
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.linalg.norm(np.diff(points, axis=0), axis=1) > epsilon
+    return points[keep]
+
+class SliderPath:
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        segment_lengths = np.linalg.norm(np.diff(self.points, axis=0), axis=1)
+        self.lengths = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+    @property
+    def length(self):
+        return float(self.lengths[-1])
+
+    def positions_at(self, distances):
+        distances = np.clip(np.asarray(distances, dtype=np.float64), 0.0, self.length)
+        return np.column_stack((
+            np.interp(distances, self.lengths, self.points[:, 0]),
+            np.interp(distances, self.lengths, self.points[:, 1]),
+        ))
+
+    def positions_at_progress(self, progress):
+        return self.positions_at(np.asarray(progress, dtype=np.float64) * self.length)
+
+    def with_length(self, pixel_length):
+        if pixel_length is None or pixel_length <= 0 or len(self.points) < 2:
+            return self
+
+        if self.length >= pixel_length:
+            end_idx = int(np.searchsorted(self.lengths, pixel_length, side='left'))
+            end_point = self.positions_at(pixel_length)[0]
+            return SliderPath(np.vstack((self.points[:end_idx], end_point)))
+
+        # Paths shorter than the declared length are extended along their last segment
+        direction = self.points[-1] - self.points[-2]
+        direction /= np.linalg.norm(direction)
+        points = self.points.copy()
+        points[-1] = points[-2] + direction * (pixel_length - self.lengths[-2])
+        return SliderPath(points)
+
+def build_slider_path(curve_type, control_points, pixel_length=None, tolerance=SLIDER_TOLERANCE, num_points=None):
+    pieces = [
+        flatten_segment(curve_type, segment, tolerance, num_points)
+        for segment in split_segments(control_points)
+    ]
+    points = remove_duplicate_points(np.concatenate(pieces))
+    return SliderPath(points).with_length(pixel_length)
@@ -0,0 +1,109 @@
+# osu_importer/utils/templates.py
+
+import bpy
+import math
+from osu_importer.utils.utils import tag_imported
+
+# Shared mesh/curve data for FULL imports, keyed by (shape, radius, resolution[, ...])
+templates = {}
+
+CIRCLE_VERTICES = 32
+SPHERE_SEGMENTS = 32
+SPHERE_RINGS = 16
+BEZIER_CIRCLE_HANDLE = 4 * (math.sqrt(2) - 1) / 3
+
+def is_template_valid(data):
+    try:
+        return data is not None and (data.name in bpy.data.meshes or data.name in bpy.data.curves)
+    except ReferenceError:
+        return False
+
+def template_name(key):
+    shape, radius, resolution = key[:3]
+    suffix = "_".join(str(value) for value in key[3:])
+    return f"osu_template_{shape}_{radius:.4f}_{resolution}" + (f"_{suffix}" if suffix else "")
+
+def get_template(key, builder):
+    data = templates.get(key)
+    if not is_template_valid(data):
+        data = builder(template_name(key))
+        tag_imported(data)
+        templates[key] = data
+    return data
+
+def circle_geometry(radius, vertices):
+    verts = [
+        (radius * math.cos(2 * math.pi * i / vertices), radius * math.sin(2 * math.pi * i / vertices), 0.0)
+        for i in range(vertices)
+    ]
+    return verts, [tuple(range(vertices))]
+
+def uv_sphere_geometry(radius, segments, rings):
+    verts = [(0.0, 0.0, radius)]
+    for ring in range(1, rings):
+        theta = math.pi * ring / rings
+        for segment in range(segments):
+            phi = 2 * math.pi * segment / segments
+            verts.append((radius * math.sin(theta) * math.cos(phi),
+                          radius * math.sin(theta) * math.sin(phi),
+                          radius * math.cos(theta)))
+    verts.append((0.0, 0.0, -radius))
+
+    bottom = len(verts) - 1
+    faces = []
+    for segment in range(segments):
+        next_segment = (segment + 1) % segments
+        faces.append((0, 1 + segment, 1 + next_segment))
+        for ring in range(rings - 2):
+            row = 1 + ring * segments
+            next_row = row + segments
+            faces.append((row + segment, next_row + segment, next_row + next_segment, row + next_segment))
+        last_row = 1 + (rings - 2) * segments
+        faces.append((last_row + next_segment, last_row + segment, bottom))
+    return verts, faces
+
+def build_mesh(name, verts, faces):
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    return mesh
+
+def get_circle_mesh(radius, vertices=CIRCLE_VERTICES):
+    return get_template(
+        ("circle", radius, vertices),
+        lambda name: build_mesh(name, *circle_geometry(radius, vertices))
+    )
+
+def get_uv_sphere_mesh(radius, segments=SPHERE_SEGMENTS, rings=SPHERE_RINGS):
+    return get_template(
+        ("sphere", radius, segments, rings),
+        lambda name: build_mesh(name, *uv_sphere_geometry(radius, segments, rings))
+    )
+
+def get_bezier_circle_curve(radius, bevel_depth=0.0, bevel_resolution=0):
+    def build(name):
+        curve = bpy.data.curves.new(name, type='CURVE')
+        curve.dimensions = '3D'
+        curve.bevel_depth = bevel_depth
+        curve.bevel_resolution = bevel_resolution
+
+        spline = curve.splines.new('BEZIER')
+        spline.bezier_points.add(3)
+        spline.use_cyclic_u = True
+        handle = radius * BEZIER_CIRCLE_HANDLE
+        for point, angle in zip(spline.bezier_points, (0.0, 0.5 * math.pi, math.pi, 1.5 * math.pi)):
+            x, y = math.cos(angle), math.sin(angle)
+            point.co = (radius * x, radius * y, 0.0)
+            point.handle_left = (radius * x + handle * y, radius * y - handle * x, 0.0)
+            point.handle_right = (radius * x - handle * y, radius * y + handle * x, 0.0)
+            point.handle_left_type = 'ALIGNED'
+            point.handle_right_type = 'ALIGNED'
+        return curve
+
+    return get_template(("bezier_circle", radius, 4, bevel_depth, bevel_resolution), build)
+
+def new_template_object(name, data, location=(0, 0, 0), rotation=(0, 0, 0)):
+    obj = bpy.data.objects.new(name, data)
+    obj.location = location
+    obj.rotation_euler = rotation
+    return obj
@@ -1,9 +1,8 @@
 # # osu_importer/utils/utils.py
 
-import time
+import os
 import bpy
-import mathutils
-from osu_importer.utils.constants import SCALE_FACTOR
+from osu_importer.utils.coordinates import map_osu_to_blender, map_osu_to_blender_array
 
 def update_dev_tools(self, context):
     if not self.dev_tools:
@@ -20,24 +19,56 @@ def update_quick_load(props):
         props.osr_file = ""
         print("Quick Load deactivated: File paths cleared.")
 
-def timeit(label):
-    class Timer:
-        def __init__(self, label):
-            self.label = label
-            self.start = None
-            self.end = None
-            self.duration = None
-
-        def __enter__(self):
-            self.start = time.perf_counter()
-            return self
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            self.end = time.perf_counter()
-            self.duration = self.end - self.start
-            print(f"[osu! Importer] {self.label}: {self.duration:.4f} Sekunden")
-
-    return Timer(label)
+def get_profile_output_dir(props):
+    if props.profile_output_dir:
+        return bpy.path.abspath(props.profile_output_dir)
+    return bpy.utils.user_resource('DATAFILES', path="osu_importer/profiles", create=True)
+
+def get_library_index_path():
+    directory = bpy.utils.user_resource('DATAFILES', path="osu_importer", create=True)
+    return os.path.join(directory, "library.sqlite")
+
+def refresh_library_results(props):
+    from osu_importer.library_index import LibraryIndex
+
+    props.library_results.clear()
+    try:
+        with LibraryIndex(get_library_index_path()) as index:
+            rows = index.search_beatmaps(props.library_search)
+    except Exception as e:
+        print(f"Error searching beatmap library: {e}")
+        return
+
+    for row in rows:
+        entry = props.library_results.add()
+        entry.name = f"{row['artist']} - {row['title']} [{row['version']}]"
+        entry.path = row["path"]
+        entry.bpm = row["bpm"] or 0.0
+        entry.object_count = row["object_count"] or 0
+    props.library_results_index = -1
+
+def find_beatmap_for_replay(osr_file_path):
+    from osu_importer.library_index import LibraryIndex
+
+    try:
+        with LibraryIndex(get_library_index_path()) as index:
+            row = index.find_beatmap_for_replay(osr_file_path)
+    except Exception as e:
+        print(f"Error looking up beatmap for replay: {e}")
+        return None
+    if row is None or not os.path.isfile(row["path"]):
+        return None
+    return row["path"]
+
+def update_library_search(self, context):
+    refresh_library_results(self)
+
+def update_library_selection(self, context):
+    if 0 <= self.library_results_index < len(self.library_results):
+        self.osu_file = self.library_results[self.library_results_index].path
+
+def get_beatmap_cache_dir():
+    return bpy.utils.user_resource('DATAFILES', path="osu_importer/beatmap_cache", create=True)
 
 def create_collection(name):
     collection = bpy.data.collections.get(name)
@@ -46,123 +77,6 @@ def create_collection(name):
         bpy.context.scene.collection.children.link(collection)
     return collection
 
-def map_osu_to_blender(x, y):
-    if not hasattr(map_osu_to_blender, 'cache'):
-        map_osu_to_blender.cache = {}
-    key = (x, y)
-    if key in map_osu_to_blender.cache:
-        return map_osu_to_blender.cache[key]
-    corrected_x = (x - 256) * SCALE_FACTOR  # Centering on zero
-    corrected_y = 0
-    corrected_z = (192 - y) * SCALE_FACTOR  # Invert and center
-    map_osu_to_blender.cache[key] = (corrected_x, corrected_y, corrected_z)
-    return corrected_x, corrected_y, corrected_z
-
-def evaluate_curve_at_t(curve_object, t):
-    t = max(0.0, min(1.0, t))
-
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    eval_curve_object = curve_object.evaluated_get(depsgraph)
-    eval_curve = eval_curve_object.data
-
-    spline = eval_curve.splines[0]
-
-    spline_length = spline.calc_length()
-
-    desired_length = t * spline_length
-
-    accumulated_length = 0.0
-
-    points = []
-    if spline.type == 'BEZIER':
-        bezier_points = spline.bezier_points
-        num_segments = len(bezier_points) - 1
-        for i in range(num_segments):
-            bp0 = bezier_points[i]
-            bp1 = bezier_points[i + 1]
-
-            p0 = bp0.co.xyz
-            p1 = bp0.handle_right.xyz
-            p2 = bp1.handle_left.xyz
-            p3 = bp1.co.xyz
-
-            segment_samples = 10
-            for j in range(segment_samples):
-                s = j / segment_samples
-                point = mathutils.geometry.interpolate_bezier(p0, p1, p2, p3, s)
-                points.append(point)
-    else:
-        spline_points = spline.points
-        points = [p.co.xyz for p in spline_points]
-
-    for i in range(len(points) - 1):
-        p0 = points[i]
-        p1 = points[i + 1]
-        segment_length = (p1 - p0).length
-        if accumulated_length + segment_length >= desired_length:
-            remaining_length = desired_length - accumulated_length
-            local_t = remaining_length / segment_length
-            position = p0.lerp(p1, local_t)
-            return curve_object.matrix_world @ position
-        accumulated_length += segment_length
-
-    last_point = points[-1]
-    return curve_object.matrix_world @ last_point
-
-def get_keyframe_values(hitobject, object_type, import_type, start_frame, end_frame, early_start_frame, approach_rate,
-                        osu_radius, extra_params=None, ms_per_frame=None, audio_lead_in_frames=None):
-    frame_values = {}
-    fixed_values = {}
-
-    frame_values["show"] = [
-        (int(early_start_frame - 1), False),
-        (int(early_start_frame), True),
-    ]
-    frame_values["was_hit"] = [
-        (int(start_frame - 1), False),
-        (int(start_frame), hitobject.was_hit)
-    ]
-
-    fixed_values["ar"] = approach_rate
-    fixed_values["cs"] = osu_radius * SCALE_FACTOR * (2 if import_type == 'BASE' else 1)
-
-    if object_type == 'circle':
-        if import_type == 'FULL':
-            frame_values["show"].append((int(start_frame + 1), False))
-    elif object_type == 'slider':
-        frame_values["show"].extend([
-            (int(end_frame - 1), True),
-            (int(end_frame), False)
-        ])
-        slider_end_frame = (hitobject.slider_end_time / ms_per_frame) + audio_lead_in_frames
-        frame_values["was_completed"] = [
-            (int(slider_end_frame - 1), False),
-            (int(slider_end_frame), True)
-        ]
-        if extra_params:
-            if "repeat_counter_keyframes" in extra_params:
-                frame_values["repeat_counter"] = extra_params["repeat_counter_keyframes"]
-                del extra_params["repeat_counter_keyframes"]  # Entferne es aus extra_params
-            fixed_values.update(extra_params)
-
-    elif object_type == 'spinner':
-        frame_values["was_completed"] = [
-            (int(end_frame - 1), False),
-            (int(end_frame), True)
-        ]
-        if extra_params:
-            fixed_values.update(extra_params)
-
-    if import_type == 'BASE' and object_type != 'circle':
-        frame_values["show"] = [
-            (int(early_start_frame - 1), False),
-            (int(early_start_frame), True),
-            (int(end_frame - 1), True),
-            (int(end_frame), False)
-        ]
-
-    return frame_values, fixed_values
-
 def tag_imported(obj, tag="osu_imported", value=True):
     obj[tag] = value
 
@@ -187,6 +101,61 @@ def flip_objects(prefixes, axis, invert_location=True, invert_scale=True):
 
     return flipped_count
 
+def load_replay_info(props):
+    from osu_importer.parsers.osu_parser import OsrParser
+
+    osr_file_path = bpy.path.abspath(props.osr_file)
+    if not props.osr_file or not os.path.isfile(osr_file_path):
+        return
+
+    # Only the header is read, the frame stream stays untouched until an import
+    try:
+        replay = OsrParser(osr_file_path, lazy=True)
+    except Exception as e:
+        print(f"Error reading replay information: {e}")
+        return
+    if replay.header is None:
+        return
+
+    props.formatted_mods = ', '.join(replay.mod_list) if replay.mod_list else "None"
+    props.accuracy = replay.calculate_accuracy()
+    props.misses = replay.misses
+    props.max_combo = replay.max_combo
+    props.total_score = replay.score
+    props.player_name = replay.username or "Unknown"
+
+def update_osr_file(self, context):
+    load_replay_info(self)
+
+def load_beatmap_info(props):
+    from osu_importer.parsers.osu_parser import read_osu_metadata
+
+    osu_file_path = bpy.path.abspath(props.osu_file)
+    if not props.osu_file or not os.path.isfile(osu_file_path):
+        return
+
+    try:
+        info = read_osu_metadata(osu_file_path)
+    except Exception as e:
+        print(f"Error reading beatmap information: {e}")
+        return
+    if info is None:
+        return
+
+    # Mods are only known after an import, until then the adjusted values show the base values
+    difficulty = info["difficulty_settings"]
+    props.title = info["metadata"].get("Title", "")
+    props.artist = info["metadata"].get("Artist", "")
+    props.difficulty_name = info["metadata"].get("Version", "")
+    props.bpm = info["bpm"]
+    props.total_hitobjects = info["total_hitobjects"]
+    props.base_approach_rate = props.adjusted_approach_rate = float(difficulty.get("ApproachRate", 5.0))
+    props.base_circle_size = props.adjusted_circle_size = float(difficulty.get("CircleSize", 5.0))
+    props.base_overall_difficulty = props.adjusted_overall_difficulty = float(difficulty.get("OverallDifficulty", 5.0))
+
+def update_osu_file(self, context):
+    load_beatmap_info(self)
+
 def update_override_mods(self, context):
     for prop_name in dir(self):
         if prop_name.startswith("override_") and prop_name != "override_mods":